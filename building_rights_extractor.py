@@ -17,6 +17,7 @@ Usage:
 
 import logging
 import re
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
@@ -317,20 +318,45 @@ def _map_columns(
     return column_map
 
 
-def _find_section5_pages(pdf: pdfplumber.PDF) -> list[dict]:
+def _page_text(
+    pdf: pdfplumber.PDF, page_idx: int, page_texts: dict[int, str],
+) -> str:
+    """Return a page's extracted text, memoized in page_texts.
+
+    Args:
+        pdf: Open pdfplumber PDF object.
+        page_idx: Zero-based page index.
+        page_texts: Cache of already-extracted text by page index.
+
+    Returns:
+        The page text ("" for pages without text).
+    """
+    text = page_texts.get(page_idx)
+    if text is None:
+        text = pdf.pages[page_idx].extract_text() or ""
+        page_texts[page_idx] = text
+    return text
+
+
+def _find_section5_pages(
+    pdf: pdfplumber.PDF, page_texts: Optional[dict[int, str]] = None,
+) -> list[dict]:
     """Find pages containing Section 5 and extract status.
 
     Args:
         pdf: Open pdfplumber PDF object.
+        page_texts: Optional page-text cache, filled as pages are read.
 
     Returns:
         List of dicts with 'page_idx' and 'status' keys.
     """
+    if page_texts is None:
+        page_texts = {}
     found = []
     pages_to_scan = min(len(pdf.pages), MAX_PAGES_TO_SCAN)
 
     for page_idx in range(pages_to_scan):
-        text = pdf.pages[page_idx].extract_text() or ""
+        text = _page_text(pdf, page_idx, page_texts)
 
         has_section = any(kw in text for kw in SECTION_KEYWORDS)
         if not has_section:
@@ -387,6 +413,7 @@ def _select_rights_table(
 def _extract_table_from_pages(
     pdf: pdfplumber.PDF,
     start_page_idx: int,
+    page_texts: Optional[dict[int, str]] = None,
 ) -> Optional[list[list[Optional[str]]]]:
     """Extract the building rights table, handling multi-page continuation.
 
@@ -396,10 +423,13 @@ def _extract_table_from_pages(
     Args:
         pdf: Open pdfplumber PDF object.
         start_page_idx: Page index where Section 5 was found.
+        page_texts: Optional page-text cache, filled as pages are read.
 
     Returns:
         Combined table rows, or None if no table found.
     """
+    if page_texts is None:
+        page_texts = {}
     # Extract from the main page
     page = pdf.pages[start_page_idx]
     tables = page.extract_tables()
@@ -418,7 +448,7 @@ def _extract_table_from_pages(
     # Check subsequent pages for continuation
     combined = list(main_table)
     for next_idx in range(start_page_idx + 1, min(len(pdf.pages), start_page_idx + 15)):
-        next_text = pdf.pages[next_idx].extract_text() or ""
+        next_text = _page_text(pdf, next_idx, page_texts)
 
         # If next page has a new Section header, stop
         if any(kw in next_text for kw in SECTION_KEYWORDS):
@@ -538,6 +568,8 @@ def _parse_table(
 def extract_building_rights(
     pdf_path: Path | str,
     plan_number: Optional[str] = None,
+    pdf: Optional[pdfplumber.PDF] = None,
+    page_texts: Optional[dict[int, str]] = None,
 ) -> dict:
     """Extract Section 5 building rights table from a Mavat plan PDF.
 
@@ -547,6 +579,10 @@ def extract_building_rights(
     Args:
         pdf_path: Path to the PDF file.
         plan_number: Optional plan number for the result metadata.
+        pdf: pdf_path already opened by the caller, to avoid parsing it
+            twice. Left open.
+        page_texts: Optional dict filled with the text of every page read
+            (by index), for callers that scan the same pages.
 
     Returns:
         Dict with keys: plan_number, status, rows, source_page,
@@ -573,9 +609,11 @@ def extract_building_rights(
     logger.info("Extracting building rights from: %s", pdf_path.name)
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
+        if page_texts is None:
+            page_texts = {}
+        with nullcontext(pdf) if pdf is not None else pdfplumber.open(pdf_path) as pdf:
             # Step 1: Find Section 5
-            section_pages = _find_section5_pages(pdf)
+            section_pages = _find_section5_pages(pdf, page_texts)
             if not section_pages:
                 result["errors"] = ["Section 5 not found in PDF"]
                 logger.warning("Section 5 not found in %s", pdf_path.name)
@@ -589,7 +627,7 @@ def extract_building_rights(
 
                 # Step 2: Extract table (with multi-page continuation)
                 raw_table = _extract_table_from_pages(
-                    pdf, section["page_idx"],
+                    pdf, section["page_idx"], page_texts,
                 )
                 if not raw_table:
                     logger.info(
@@ -95,6 +95,8 @@ API_RETRY_BACKOFF: float = float(_get("API_RETRY_BACKOFF", "2.0"))
 # ============================================================================
 
 CACHE_TTL: int = _get_int("CACHE_TTL", 3600)  # seconds
+# How often the dashboard re-checks whether the tenders table changed
+TENDERS_FRESHNESS_TTL: int = _get_int("TENDERS_FRESHNESS_TTL", 60)  # seconds
 
 # ============================================================================
 # PATHS
@@ -11,24 +11,98 @@ from typing import Dict, Optional
 import pandas as pd
 import streamlit as st
 
-from config import CACHE_TTL, DATA_DIR, DEV_USER_EMAIL, PROJECT_ROOT
+from config import (
+    CACHE_TTL,
+    DATA_DIR,
+    DEV_USER_EMAIL,
+    PROJECT_ROOT,
+    TENDERS_FRESHNESS_TTL,
+)
 from data_client import LandTendersClient, generate_sample_data
 
 logger = logging.getLogger(__name__)
 
 
-@st.cache_data(ttl=CACHE_TTL)
+@st.cache_resource
+def get_client(data_dir: str) -> LandTendersClient:
+    """Return a LandTendersClient shared across reruns and sessions.
+
+    One instance per data directory, so its requests.Session keeps pooled
+    keep-alive connections to the Land Authority API between calls.
+
+    Args:
+        data_dir: Directory for snapshots and the details cache.
+
+    Returns:
+        The shared client.
+    """
+    return LandTendersClient(data_dir=data_dir)
+
+
+def _match_db_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Give a JSON/API frame the dtypes TenderDB.load_current_tenders returns.
+
+    Low-cardinality label columns become ``category`` and the remaining
+    all-text object columns Arrow-backed strings (pyarrow ships with
+    Streamlit), so every load path gets the same fast isin/str/value_counts.
+
+    Args:
+        df: Tenders DataFrame.
+
+    Returns:
+        The same DataFrame, converted in place.
+    """
+    from db import CATEGORY_COLUMNS
+
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif df[col].dtype == object and pd.api.types.infer_dtype(df[col]) == "string":
+            df[col] = df[col].astype(pd.StringDtype("pyarrow"))
+    return df
+
+
+@st.cache_data(ttl=TENDERS_FRESHNESS_TTL)
+def _tenders_freshness_token() -> Optional[str]:
+    """Fetch the tenders table's freshness token (count + max last_updated).
+
+    Returns:
+        The token from TenderDB, or None if the database is unreachable.
+    """
+    try:
+        from db import TenderDB
+
+        return TenderDB().get_tenders_freshness_token()
+    except Exception as exc:
+        logger.warning("Could not check tenders freshness: %s", exc)
+        return None
+
+
 def load_data(data_source: str = "latest_file") -> pd.DataFrame:
     """Load tender data from Supabase DB, JSON file, or API (with fallbacks).
 
+    The frame is cached as a resource keyed on the tenders freshness token,
+    so it is reloaded after any tender write (checked at most every
+    TENDERS_FRESHNESS_TTL seconds) and otherwise kept up to CACHE_TTL.
+    Every rerun and session gets the same DataFrame object instead of an
+    unpickled copy, so callers must treat it as read-only and copy before
+    adding or changing columns.
+
     Args:
         data_source: One of "latest_file", "sample". Controls fallback chain.
 
     Returns:
-        DataFrame of tenders with normalized columns.
+        Shared, read-only DataFrame of tenders with normalized columns.
     """
+    token = None if data_source == "sample" else _tenders_freshness_token()
+    return _load_data(data_source, token)
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=4)
+def _load_data(data_source: str, freshness_token: Optional[str]) -> pd.DataFrame:
+    """Uncached body of load_data; ``freshness_token`` is only a cache key."""
     if data_source == "sample":
-        return generate_sample_data()
+        return _match_db_dtypes(generate_sample_data())
 
     # Priority 1: Supabase database
     try:
@@ -43,11 +117,11 @@ def load_data(data_source: str = "latest_file") -> pd.DataFrame:
         logger.warning("Could not load from database: %s", exc)
 
     # Priority 2: JSON snapshot file
-    client = LandTendersClient(data_dir=str(PROJECT_ROOT))
+    client = get_client(str(PROJECT_ROOT))
     if data_source == "latest_file":
         df = client.load_latest_json_snapshot()
         if df is not None:
-            return df
+            return _match_db_dtypes(df)
         logger.warning("No JSON files found, fetching from API")
         st.warning("לא נמצאו קבצי JSON, טוען מהAPI...")
 
@@ -56,10 +130,10 @@ def load_data(data_source: str = "latest_file") -> pd.DataFrame:
     if df is None:
         logger.error("Could not fetch from API, falling back to sample data")
         st.error("לא ניתן לטעון מהAPI. מציג נתונים לדוגמה.")
-        return generate_sample_data()
+        return _match_db_dtypes(generate_sample_data())
 
     client.save_json_snapshot(df)
-    return df
+    return _match_db_dtypes(df)
 
 
 @st.cache_data(ttl=CACHE_TTL)
@@ -72,7 +146,7 @@ def load_tender_details(tender_id: int) -> Optional[Dict]:
     Returns:
         Dict of tender details from the API, or None if not found.
     """
-    client = LandTendersClient(data_dir=str(DATA_DIR))
+    client = get_client(str(DATA_DIR))
     return client.get_tender_details_cached(tender_id)
 
 
@@ -9,6 +9,7 @@ API base: https://apps.land.gov.il/MichrazimSite/api/
 
 import json
 import logging
+import threading
 import time
 import urllib.parse
 from datetime import datetime
@@ -26,6 +27,8 @@ from config import (
     API_TIMEOUT,
     CACHE_TTL,
     DATA_DIR,
+    DEFAULT_FETCH_DELAY,
+    DEFAULT_FETCH_WORKERS,
     DETAIL_TIMEOUT,
     DOCUMENT_DOWNLOAD_API,
     LAND_AUTHORITY_API,
@@ -218,20 +221,17 @@ class LandTendersClient:
             logger.error("Invalid JSON for tender %d: %s", tender_id, exc)
             return None
 
-    def get_tender_details_cached(
-        self, tender_id: int, force_refresh: bool = False,
-    ) -> Optional[Dict[str, Any]]:
-        """Fetch tender details with two-tier caching (memory + file).
+    def _cached_details(self, tender_id: int) -> Optional[Dict[str, Any]]:
+        """Return fresh cached details (memory, then file), or None on a miss.
 
         Args:
-            tender_id: Tender ID to fetch.
-            force_refresh: Bypass cache if True.
+            tender_id: Tender ID to look up.
 
         Returns:
-            Detail dict, or None on failure.
+            Cached detail dict, or None if absent or older than the TTL.
         """
         # Check in-memory cache
-        if not force_refresh and tender_id in self._details_cache:
+        if tender_id in self._details_cache:
             cached_data, cached_time = self._details_cache[tender_id]
             age = (datetime.now() - cached_time).total_seconds()
             if age < self._cache_ttl:
@@ -241,7 +241,7 @@ class LandTendersClient:
         # Check file cache
         cache_file = self.data_dir / "details_cache" / f"{tender_id}.json"
 
-        if not force_refresh and cache_file.exists():
+        if cache_file.exists():
             try:
                 cached_data = json.loads(cache_file.read_text(encoding="utf-8"))
                 file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
@@ -254,11 +254,22 @@ class LandTendersClient:
             except Exception as exc:
                 logger.warning("Failed to load cache file for %d: %s", tender_id, exc)
 
-        # Fetch from API
+        return None
+
+    def _fetch_and_cache_details(self, tender_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch details from the API and store them in both cache tiers.
+
+        Args:
+            tender_id: Tender ID to fetch.
+
+        Returns:
+            Detail dict, or None on failure.
+        """
         details = self.fetch_tender_details(tender_id)
 
         if details:
             self._details_cache[tender_id] = (details, datetime.now())
+            cache_file = self.data_dir / "details_cache" / f"{tender_id}.json"
             cache_file.parent.mkdir(parents=True, exist_ok=True)
             cache_file.write_text(
                 json.dumps(details, ensure_ascii=False, indent=2, default=str),
@@ -267,18 +278,42 @@ class LandTendersClient:
 
         return details
 
+    def get_tender_details_cached(
+        self, tender_id: int, force_refresh: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch tender details with two-tier caching (memory + file).
+
+        Args:
+            tender_id: Tender ID to fetch.
+            force_refresh: Bypass cache if True.
+
+        Returns:
+            Detail dict, or None on failure.
+        """
+        if not force_refresh:
+            cached = self._cached_details(tender_id)
+            if cached is not None:
+                return cached
+
+        return self._fetch_and_cache_details(tender_id)
+
     def fetch_multiple_details(
         self,
         tender_ids: List[int],
-        max_workers: int = 3,
-        delay_seconds: float = 1.0,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+        delay_seconds: float = DEFAULT_FETCH_DELAY,
     ) -> Dict[int, Dict]:
         """Fetch details for multiple tenders with rate limiting.
 
+        Cached tenders are served immediately; only cache misses hit the API.
+        Request starts are spaced ``delay_seconds / max_workers`` apart, the
+        same peak rate as each worker pausing ``delay_seconds`` per request,
+        without sleeping for tenders that never reach the network.
+
         Args:
             tender_ids: List of tender IDs.
             max_workers: Concurrent workers.
-            delay_seconds: Delay between requests.
+            delay_seconds: Per-worker delay between requests.
 
         Returns:
             Dict mapping tender_id to detail dict.
@@ -286,24 +321,42 @@ class LandTendersClient:
         from concurrent.futures import ThreadPoolExecutor, as_completed
 
         results: Dict[int, Dict] = {}
+        misses: List[int] = []
+        for tid in tender_ids:
+            cached = self._cached_details(tid)
+            if cached:
+                results[tid] = cached
+            else:
+                misses.append(tid)
 
-        def fetch_with_delay(tid: int) -> tuple:
-            time.sleep(delay_seconds)
-            return tid, self.get_tender_details_cached(tid)
+        logger.info(
+            "Fetching details for %d tenders (%d cached)...",
+            len(tender_ids), len(results),
+        )
 
-        logger.info("Fetching details for %d tenders...", len(tender_ids))
+        interval = delay_seconds / max(max_workers, 1)
+        slot_lock = threading.Lock()
+        next_slot = time.monotonic()
+
+        def fetch_throttled(tid: int) -> tuple:
+            nonlocal next_slot
+            with slot_lock:
+                now = time.monotonic()
+                wait = next_slot - now
+                next_slot = max(now, next_slot) + interval
+            if wait > 0:
+                time.sleep(wait)
+            return tid, self._fetch_and_cache_details(tid)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(fetch_with_delay, tid): tid for tid in tender_ids
-            }
+            futures = [executor.submit(fetch_throttled, tid) for tid in misses]
 
             for i, future in enumerate(as_completed(futures), 1):
                 tender_id, details = future.result()
                 if details:
                     results[tender_id] = details
                 if i % 10 == 0:
-                    logger.info("Progress: %d/%d details fetched", i, len(tender_ids))
+                    logger.info("Progress: %d/%d details fetched", i, len(misses))
 
         logger.info(
             "Fetched details for %d/%d tenders", len(results), len(tender_ids),
@@ -354,20 +407,19 @@ class LandTendersClient:
         date_columns = ["publish_date", "deadline", "committee_date"]
         for col in date_columns:
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
-                if df[col].dtype == "datetime64[ns, UTC]":
-                    df[col] = df[col].dt.tz_localize(None)
+                # utc=True always yields UTC-aware values; strip to naive
+                df[col] = pd.to_datetime(df[col], errors="coerce", utc=True).dt.tz_localize(None)
 
         logger.info("Processed %d tenders", len(df))
         return df
 
     def save_snapshot(self, df: pd.DataFrame, prefix: str = "tenders") -> str:
-        """Save a timestamped CSV snapshot."""
+        """Save a timestamped Parquet snapshot (typed, so dates stay datetimes)."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{prefix}_{timestamp}.csv"
+        filename = f"{prefix}_{timestamp}.parquet"
         filepath = self.data_dir / filename
-        df.to_csv(filepath, index=False, encoding="utf-8-sig")
-        logger.info("Saved CSV snapshot: %s", filepath)
+        df.to_parquet(filepath, index=False, compression="zstd")
+        logger.info("Saved Parquet snapshot: %s", filepath)
         return str(filepath)
 
     def save_json_snapshot(self, df: pd.DataFrame) -> str:
@@ -386,7 +438,9 @@ class LandTendersClient:
     def load_latest_json_snapshot(self) -> Optional[pd.DataFrame]:
         """Load the most recent tenders_list_*.json snapshot.
 
-        Applies field normalization and code-to-label mappings.
+        Applies field normalization and code-to-label mappings. The normalized
+        frame is cached next to the JSON as Parquet and reused while it is at
+        least as new as the JSON, skipping the parse and date coercion.
         """
         import re
 
@@ -406,6 +460,15 @@ class LandTendersClient:
             return "00000000"
 
         latest = max(files, key=parse_date)
+        cache = latest.with_suffix(".parquet")
+
+        if cache.exists() and cache.stat().st_mtime >= latest.stat().st_mtime:
+            try:
+                df = pd.read_parquet(cache)
+                logger.info("Loaded %d tenders from %s", len(df), cache.name)
+                return df
+            except Exception as exc:
+                logger.warning("Failed to read %s, re-parsing JSON: %s", cache.name, exc)
 
         try:
             df = pd.read_json(latest, encoding="utf-8")
@@ -421,36 +484,72 @@ class LandTendersClient:
             date_columns = ["publish_date", "deadline", "committee_date"]
             for col in date_columns:
                 if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
-                    if df[col].dtype == "datetime64[ns, UTC]":
-                        df[col] = df[col].dt.tz_localize(None)
-
-            return df
+                    df[col] = pd.to_datetime(df[col], errors="coerce", utc=True).dt.tz_localize(None)
 
         except Exception as exc:
             logger.error("Error loading %s: %s", latest, exc)
             return None
 
+        try:
+            df.to_parquet(cache, index=False)
+        except Exception as exc:
+            logger.warning("Could not cache snapshot to %s: %s", cache.name, exc)
+
+        return df
+
+    def _snapshot_files(self, prefix: str) -> list[Path]:
+        """List Parquet and legacy CSV snapshots, oldest first."""
+        files = [
+            *self.data_dir.glob(f"{prefix}_[0-9]*.parquet"),
+            *self.data_dir.glob(f"{prefix}_[0-9]*.csv"),
+        ]
+        return sorted(files, key=lambda f: f.stem)
+
     def load_latest_snapshot(self, prefix: str = "tenders") -> Optional[pd.DataFrame]:
-        """Load the most recent CSV snapshot."""
-        files = sorted(self.data_dir.glob(f"{prefix}_*.csv"))
+        """Load the most recent snapshot (Parquet, or a legacy CSV)."""
+        files = self._snapshot_files(prefix)
         if not files:
             return None
-        return pd.read_csv(files[-1])
+        latest = files[-1]
+        if latest.suffix == ".csv":
+            return pd.read_csv(latest)
+        return pd.read_parquet(latest)
 
     def load_all_snapshots(self, prefix: str = "tenders") -> pd.DataFrame:
-        """Load and combine all historical CSV snapshots."""
-        files = sorted(self.data_dir.glob(f"{prefix}_*.csv"))
+        """Load and combine all historical snapshots.
+
+        Parquet snapshots are concatenated as Arrow tables and converted to
+        pandas once, rather than building and then concatenating a DataFrame
+        per file. Legacy CSV snapshots (written before the switch to Parquet)
+        are read with pandas and merged in snapshot order.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        files = self._snapshot_files(prefix)
         if not files:
             return pd.DataFrame()
 
-        dfs = []
+        tables = []
+        legacy = []
         for f in files:
-            df = pd.read_csv(f)
-            df["_snapshot_date"] = f.stem.replace(f"{prefix}_", "")
-            dfs.append(df)
+            snapshot = f.stem.replace(f"{prefix}_", "")
+            if f.suffix == ".csv":
+                legacy.append(pd.read_csv(f).assign(_snapshot_date=snapshot))
+                continue
+            table = pq.read_table(f)
+            tables.append(
+                table.append_column("_snapshot_date", pa.array([snapshot] * table.num_rows)),
+            )
 
-        return pd.concat(dfs, ignore_index=True)
+        frames = legacy
+        if tables:
+            frames.append(pa.concat_tables(tables, promote_options="permissive").to_pandas())
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True).sort_values(
+            "_snapshot_date", kind="stable", ignore_index=True,
+        )
 
     # ────────────────────────────────────────────────────────────────────────
     # Database persistence
@@ -486,20 +585,18 @@ class LandTendersClient:
         from db import TenderDB
 
         db = TenderDB()
-        new_doc_count = 0
-
-        for tid in tender_ids:
-            details = self.get_tender_details_cached(tid)
-            if not details:
-                continue
+        docs_by_tender: Dict[int, List[Dict]] = {}
 
+        for tid, details in self.fetch_multiple_details(tender_ids).items():
             doc_list = list(details.get("MichrazDocList", []))
             full_doc = details.get("MichrazFullDocument")
             if full_doc and full_doc.get("RowID") is not None:
                 doc_list.append(full_doc)
 
-            new_docs = db.upsert_documents(tid, doc_list)
-            new_doc_count += len(new_docs)
+            docs_by_tender[tid] = doc_list
+
+        new_docs = db.upsert_documents_bulk(docs_by_tender)
+        new_doc_count = sum(len(docs) for docs in new_docs.values())
 
         return new_doc_count
 
@@ -20,13 +20,30 @@ Usage:
     df = db.load_current_tenders()
 """
 
+import hashlib
+import json
 import logging
 import math
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
+try:
+    import httpx
+except ImportError:  # installed with supabase
+    httpx = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional — installed alongside Streamlit
+    pa = None
+
 logger = logging.getLogger(__name__)
 
 # Column names expected in the tenders DataFrame (from normalize_api_columns).
@@ -38,12 +55,76 @@ TENDER_COLUMNS = [
     "area_sqm", "min_price", "gush", "helka",
 ]
 
+# Timestamp columns converted to tz-naive datetimes on load.
+_DATE_COLUMNS = ("publish_date", "deadline", "committee_date")
+
+# Low-cardinality label columns stored as pandas ``category`` on load.
+CATEGORY_COLUMNS = ("city", "region", "status", "tender_type", "purpose")
+
+# infer_dtype kinds whose values serialize to JSON as-is (once nulls are None).
+_NATIVE_KINDS = frozenset({"string", "integer", "empty"})
+
 # Batch size for Supabase upsert operations.
 _BATCH_SIZE = 500
 
 # Page size for paginated reads (Supabase default limit is 1000).
 _PAGE_SIZE = 1000
 
+# Retry policy for transient Supabase failures (rate limits, gateway errors,
+# dropped connections): delay = min(base * 2**attempt + U(0, jitter), cap).
+_MAX_RETRIES = 5
+_RETRY_BASE = 1.0
+_RETRY_CAP = 32.0
+_RETRY_JITTER = 0.5
+
+# Reads on the Streamlit render path and schema probes retry only once
+# (~1.5s worst case) so an outage reaches their error handling/fallbacks
+# fast; cron writes keep the full _MAX_RETRIES budget (~31s).
+_INTERACTIVE_RETRIES = 1
+
+# Error codes worth retrying. PostgREST reports non-JSON gateway responses
+# with the HTTP status as ``code``; the rest are PostgREST connection-pool
+# errors and Postgres SQLSTATEs for dropped connections, serialization
+# failures, deadlocks and resource exhaustion.
+_TRANSIENT_CODES = frozenset({
+    "429", "500", "502", "503", "504",
+    "PGRST000", "PGRST001", "PGRST002", "PGRST003",
+    "40001", "40P01",
+})
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "53")
+
+# Max concurrent batch requests. Batch upserts are I/O-bound (one HTTPS
+# round trip each), so a small thread pool overlaps their latency.
+_MAX_WORKERS = 4
+
+
+def _clean_float(val: float) -> Optional[float]:
+    """Return None for NaN/inf, else the float unchanged."""
+    return None if math.isnan(val) or math.isinf(val) else val
+
+
+def _isoformat(val: object) -> str:
+    """Serialize a date/datetime/Timestamp to an ISO string."""
+    return val.isoformat()
+
+
+# Exact-type handlers for _clean_val: one dict lookup replaces the
+# isinstance cascade for the types that make up nearly every payload cell.
+_CLEAN_DISPATCH: dict[type, Callable[[object], object]] = {
+    type(None): lambda v: None,
+    str: lambda v: v,
+    int: lambda v: v,
+    # bool must map to int (bool is a subclass of int, so check exact type)
+    bool: int,
+    np.bool_: int,
+    float: _clean_float,
+    np.float64: _clean_float,
+    pd.Timestamp: _isoformat,
+    type(pd.NaT): lambda v: None,
+    datetime: _isoformat,
+    date: _isoformat,
+}
+
 
 def _clean_val(val: object) -> object:
     """Convert NaN/NaT/inf to None for JSON-safe Supabase payloads.
@@ -55,33 +136,276 @@ def _clean_val(val: object) -> object:
         val: Any Python value (from a pandas row or dict).
 
     Returns:
-        The value, or None if it's NaN/NaT/inf/empty-string.
+        The value, or None if it's NaN/NaT/inf.
     """
-    if val is None:
-        return None
-    # bool check MUST come before numeric checks (bool is subclass of int)
-    if isinstance(val, (bool,)):
+    handler = _CLEAN_DISPATCH.get(type(val))
+    if handler is not None:
+        return handler(val)
+
+    # Uncommon types and subclasses
+    if isinstance(val, (bool, np.bool_)):
         return int(val)
-    try:
-        import numpy as np
-        if isinstance(val, np.bool_):
-            return int(val)
-    except ImportError:
-        pass
-    if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
+    if isinstance(val, float):
+        return _clean_float(val)
+    if val is pd.NaT:
         return None
-    if isinstance(val, pd.Timestamp):
-        if pd.isna(val):
-            return None
-        return val.isoformat()
     if hasattr(val, "isoformat"):
         return val.isoformat()
     return val
 
 
-def _clean_dict(d: dict) -> dict:
-    """Apply _clean_val to every value in a dict."""
-    return {k: _clean_val(v) for k, v in d.items()}
+def _to_naive_datetime(series: pd.Series) -> pd.Series:
+    """Parse ISO-8601 timestamp strings into tz-naive UTC datetimes.
+
+    Passing ``format="ISO8601"`` skips pandas' per-element format inference,
+    and dropping the (already UTC) timezone is a metadata-only change.
+
+    Args:
+        series: Column of ISO timestamp strings as returned by Supabase.
+
+    Returns:
+        tz-naive datetime64 Series; unparseable values become NaT.
+    """
+    parsed = pd.to_datetime(series, errors="coerce", utc=True, format="ISO8601")
+    return parsed.dt.tz_localize(None)
+
+
+def _arrow_types(arrow_type: "pa.DataType") -> Optional[pd.api.extensions.ExtensionDtype]:
+    """Map Arrow string columns to pandas' Arrow-backed string dtype."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None  # numeric/bool/nested columns keep their default NumPy dtype
+
+
+def _pages_to_frame(pages: Iterable[list[dict]]) -> pd.DataFrame:
+    """Build a DataFrame column-wise from pages of PostgREST row dicts.
+
+    When pyarrow is available (it ships with Streamlit), each page is
+    converted to an Arrow table as it arrives, so the row dicts of earlier
+    pages can be freed before later ones are read, and text columns come
+    back as Arrow-backed strings, which are smaller and faster to scan than
+    object columns. Otherwise, or if Arrow can't unify a column's types
+    (e.g. ragged JSONB), the uniform row dicts are transposed into
+    ``{column: values}`` so pandas builds each column in one go.
+
+    Args:
+        pages: Lists of row dicts, e.g. from :meth:`TenderDB._paginated_pages`.
+
+    Returns:
+        DataFrame with one column per key (empty if no rows).
+    """
+    pages = iter(pages)
+    rows: list[dict] = []
+    if pa is not None:
+        tables: list = []
+        page: list[dict] = []
+        try:
+            for page in pages:
+                if page:
+                    tables.append(pa.Table.from_pylist(page))
+            page = []
+            if not tables:
+                return pd.DataFrame()
+            table = pa.concat_tables(tables, promote_options="permissive")
+            return table.to_pandas(types_mapper=_arrow_types)
+        except (pa.ArrowException, ValueError, TypeError) as exc:
+            logger.debug("Arrow frame construction failed, using dict path: %s", exc)
+            # Recover the pages converted so far plus the one that failed
+            rows = [r for t in tables for r in t.to_pylist()] + page
+    for page in pages:
+        rows.extend(page)
+    if not rows:
+        return pd.DataFrame()
+    columns = list(rows[0])
+    return pd.DataFrame({col: [r.get(col) for r in rows] for col in columns})
+
+
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Null out NaN/inf/NaT in float and datetime columns in one vectorized pass.
+
+    These columns are replaced by object columns holding the original values
+    and ``None``, so per-row cleaning no longer has to test each cell for
+    missing values. Other columns are passed through unchanged (the input is
+    not mutated).
+
+    Args:
+        df: DataFrame about to be serialized for Supabase.
+
+    Returns:
+        A shallow copy of df with JSON-safe float columns.
+    """
+    out = df.copy(deep=False)
+    for col in out.columns:
+        dtype = out[col].dtype
+        if pd.api.types.is_float_dtype(dtype):
+            values = out[col].to_numpy(dtype="float64", na_value=np.nan)
+            cleaned = values.astype(object)
+            cleaned[~np.isfinite(values)] = None
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            # NaT has an isoformat() too ("NaT"), so null it out here
+            cleaned = out[col].to_numpy(dtype=object)
+            cleaned[out[col].isna().to_numpy()] = None
+        else:
+            continue
+        # Explicit object dtype — pandas would re-infer datetime64 otherwise
+        out[col] = pd.Series(cleaned, index=out.index, dtype=object)
+    return out
+
+
+def _frame_records(df: pd.DataFrame) -> list[dict]:
+    """Convert a DataFrame to JSON-safe row dicts column by column.
+
+    Builds on :func:`_clean_frame`: bool columns become 0/1 ints, missing
+    values in object and extension columns become ``None``, and only object
+    columns holding something other than plain strings/ints (timestamps,
+    bools, stray floats) fall back to per-cell :func:`_clean_val`.
+
+    Args:
+        df: DataFrame about to be sent to Supabase.
+
+    Returns:
+        One dict per row, ready for ``upsert``.
+    """
+    out = _clean_frame(df)
+    for col in out.columns:
+        dtype = out[col].dtype
+        if pd.api.types.is_bool_dtype(dtype) and not isinstance(
+            dtype, pd.api.extensions.ExtensionDtype
+        ):
+            out[col] = out[col].astype("int64")
+            continue
+        if isinstance(dtype, np.dtype) and dtype != object:
+            continue  # int columns; float/datetime already cleaned
+        values = out[col].to_numpy(dtype=object)
+        if pd.api.types.infer_dtype(values, skipna=True) in _NATIVE_KINDS:
+            values = values.copy()
+            values[pd.isna(values)] = None
+        else:
+            values = np.array([_clean_val(v) for v in values], dtype=object)
+        out[col] = pd.Series(values, index=out.index, dtype=object)
+    return out.to_dict(orient="records")
+
+
+def _content_hash(record: dict) -> str:
+    """Fingerprint a cleaned row independently of the source column dtypes.
+
+    Integral floats hash as ints, so a column parsed as int64 one day and
+    float64 or object the next does not mark every row as changed.
+
+    Args:
+        record: One row from :func:`_frame_records`.
+
+    Returns:
+        Hex SHA-1 of the row's canonical JSON.
+    """
+    canonical = {}
+    for k, v in record.items():
+        if isinstance(v, np.integer) or (
+            isinstance(v, (float, np.floating)) and float(v).is_integer()
+        ):
+            v = int(v)
+        canonical[k] = v
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Return True if a Supabase error is worth retrying."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        return True
+    code = str(getattr(exc, "code", "") or "")
+    return code in _TRANSIENT_CODES or code.startswith(_TRANSIENT_SQLSTATE_CLASSES)
+
+
+def _execute(query, max_retries: int = _MAX_RETRIES):
+    """Execute a PostgREST request, retrying transient failures.
+
+    Rate limits (429), gateway errors (5xx) and dropped connections are
+    retried with capped exponential backoff plus jitter; anything else is
+    raised immediately. Every call site is a read or an idempotent
+    upsert/update, so re-sending is safe.
+
+    Args:
+        query: A supabase-py request builder (table query or rpc call).
+        max_retries: Retries after the first attempt (use
+            _INTERACTIVE_RETRIES for page-render reads and probes).
+
+    Returns:
+        The builder's ``execute()`` response.
+
+    Raises:
+        Exception: The last error, once retries are exhausted or if it is
+            not transient.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return query.execute()
+        except Exception as exc:
+            if attempt == max_retries or not _is_transient(exc):
+                raise
+            wait = min(
+                _RETRY_BASE * 2 ** attempt + random.random() * _RETRY_JITTER,
+                _RETRY_CAP,
+            )
+            logger.warning(
+                "Supabase request failed (attempt %d/%d): %s — retrying in %.1fs",
+                attempt + 1, _MAX_RETRIES + 1, exc, wait,
+            )
+            time.sleep(wait)
+
+
+def _clean_int(val: object) -> object:
+    """Apply _clean_val, then cast floats to int for INT columns (3.0 → 3)."""
+    cleaned = _clean_val(val)
+    return int(cleaned) if isinstance(cleaned, float) else cleaned
+
+
+def _field_actions(
+    field_map: dict[str, str], int_cols: set[str],
+) -> dict[str, tuple[str, Callable[[object], object]]]:
+    """Resolve each source field to its target column and cleaner once.
+
+    Args:
+        field_map: Source field name → table column name.
+        int_cols: Table columns typed as INT.
+
+    Returns:
+        Dict mapping source field → (column, cleaner).
+    """
+    return {
+        src: (col, _clean_int if col in int_cols else _clean_val)
+        for src, col in field_map.items()
+    }
+
+
+def _to_jsonable(obj: object) -> object:
+    """Recursively convert a nested value to strict JSON for JSONB columns.
+
+    NaN/inf/NaT/NA become ``None`` (stdlib json would emit a bare ``NaN``,
+    which Postgres rejects), numpy scalars become Python scalars, and
+    anything else non-JSON is stringified like ``json.dumps(default=str)``.
+
+    Args:
+        obj: Dict/list/scalar structure, e.g. extracted lots data.
+
+    Returns:
+        The same structure built from JSON-native values only.
+    """
+    if isinstance(obj, dict):
+        return {k if isinstance(k, str) else str(k): _to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_jsonable(v) for v in obj]
+    if obj is None or isinstance(obj, (str, bool, int)):
+        return obj
+    if isinstance(obj, float):
+        return _clean_float(float(obj))
+    if isinstance(obj, np.generic):
+        return _to_jsonable(obj.item())
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    return str(obj)
 
 
 class TenderDB:
@@ -106,18 +430,24 @@ class TenderDB:
     # Paginated read helper
     # ------------------------------------------------------------------
 
-    def _paginated_select(
+    def _paginated_pages(
         self,
         table: str,
         select: str = "*",
         filters: Optional[dict] = None,
         order_col: Optional[str] = None,
         order_desc: bool = False,
-    ) -> list[dict]:
-        """Fetch all rows from a table using pagination.
-
-        Supabase REST API returns at most 1000 rows per request.
-        This method pages through until all rows are retrieved.
+        gt_filters: Optional[dict] = None,
+        max_retries: int = _MAX_RETRIES,
+    ) -> Iterator[list[dict]]:
+        """Yield all rows from a table page by page, in order.
+
+        Supabase REST API returns at most 1000 rows per request. The first
+        page is requested with ``count="exact"`` to learn the total row
+        count; the remaining pages are then fetched concurrently and yielded
+        in order as they complete, so callers can convert and drop each page
+        instead of holding every row dict at once. If the server returns no
+        count, pages are fetched one at a time until a short page.
 
         Args:
             table: Table name.
@@ -125,15 +455,130 @@ class TenderDB:
             filters: Dict of {column: value} equality filters.
             order_col: Column to order by. Required for stable pagination.
             order_desc: If True, order descending.
+            gt_filters: Dict of {column: value} "greater than" filters.
+            max_retries: Retry budget per page request (see _execute).
+
+        Yields:
+            Lists of row dicts, one per page.
+        """
+        if not self._client:
+            return
+
+        def fetch_page(offset: int, count: Optional[str] = None):
+            query = self._client.table(table).select(select, count=count)
+
+            if filters:
+                for col, val in filters.items():
+                    query = query.eq(col, val)
+
+            if gt_filters:
+                for col, val in gt_filters.items():
+                    query = query.gt(col, val)
+
+            if order_col:
+                query = query.order(order_col, desc=order_desc)
+
+            return _execute(
+                query.range(offset, offset + _PAGE_SIZE - 1), max_retries=max_retries,
+            )
+
+        try:
+            first = fetch_page(0, count="exact")
+        except Exception as exc:
+            logger.error("Paginated select from %s failed: %s", table, exc)
+            return
+
+        first_rows = first.data or []
+        yield first_rows
+        if len(first_rows) < _PAGE_SIZE:
+            return  # Single page
+
+        if first.count is None:
+            # No total to plan from: page sequentially until a short page
+            logger.warning(
+                "No row count for %s, paging sequentially", table,
+            )
+            offset = _PAGE_SIZE
+            while True:
+                try:
+                    page = fetch_page(offset).data or []
+                except Exception as exc:
+                    logger.error("Paginated select from %s failed: %s", table, exc)
+                    return
+                yield page
+                if len(page) < _PAGE_SIZE:
+                    return
+                offset += _PAGE_SIZE
+
+        offsets = list(range(_PAGE_SIZE, first.count, _PAGE_SIZE))
+        if not offsets:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(offsets))) as pool:
+            futures = deque(pool.submit(fetch_page, offset) for offset in offsets)
+            while futures:
+                # popleft so a yielded page isn't kept alive by its future
+                future = futures.popleft()
+                try:
+                    page = future.result().data or []
+                except Exception as exc:
+                    # Keep the contiguous prefix only — a gap would be worse
+                    logger.error("Paginated select from %s failed: %s", table, exc)
+                    for pending in futures:
+                        pending.cancel()
+                    return
+                yield page
+
+    def _paginated_select(
+        self,
+        table: str,
+        select: str = "*",
+        filters: Optional[dict] = None,
+        order_col: Optional[str] = None,
+        order_desc: bool = False,
+        gt_filters: Optional[dict] = None,
+        max_retries: int = _MAX_RETRIES,
+    ) -> list[dict]:
+        """Fetch all rows from a table using pagination.
+
+        Same arguments as :meth:`_paginated_pages`, with the pages flattened.
 
         Returns:
             List of row dicts.
         """
+        pages = self._paginated_pages(
+            table, select, filters, order_col, order_desc, gt_filters, max_retries,
+        )
+        return [row for page in pages for row in page]
+
+    def _keyset_pages(
+        self,
+        table: str,
+        key_cols: tuple[str, ...],
+        select: str = "*",
+        filters: Optional[dict] = None,
+    ) -> Iterator[list[dict]]:
+        """Yield all rows page by page using keyset (cursor) pagination.
+
+        Each page asks for rows *after* the last key seen instead of using an
+        OFFSET, so Postgres reads only ``_PAGE_SIZE`` index entries per page
+        no matter how deep into the table it is. Use this for large tables
+        such as tender_history; pages are fetched sequentially.
+
+        Args:
+            table: Table name.
+            key_cols: One or two columns that together are unique and
+                indexed, e.g. ("snapshot_date", "tender_id").
+            select: Column selection string. Must include key_cols.
+            filters: Dict of {column: value} equality filters.
+
+        Yields:
+            Lists of row dicts, ordered by key_cols.
+        """
         if not self._client:
-            return []
+            return
 
-        all_rows: list[dict] = []
-        offset = 0
+        last: Optional[tuple] = None
 
         while True:
             query = self._client.table(table).select(select)
@@ -142,26 +587,98 @@ class TenderDB:
                 for col, val in filters.items():
                     query = query.eq(col, val)
 
-            if order_col:
-                query = query.order(order_col, desc=order_desc)
+            if last is not None:
+                if len(key_cols) == 1:
+                    query = query.gt(key_cols[0], last[0])
+                else:
+                    (c1, c2), (v1, v2) = key_cols, last
+                    query = query.or_(f"{c1}.gt.{v1},and({c1}.eq.{v1},{c2}.gt.{v2})")
 
-            query = query.range(offset, offset + _PAGE_SIZE - 1)
+            for col in key_cols:
+                query = query.order(col)
 
             try:
-                result = query.execute()
+                result = _execute(query.limit(_PAGE_SIZE))
             except Exception as exc:
-                logger.error("Paginated select from %s failed: %s", table, exc)
-                break
+                logger.error("Keyset select from %s failed: %s", table, exc)
+                return
 
             rows = result.data or []
-            all_rows.extend(rows)
+            yield rows
 
             if len(rows) < _PAGE_SIZE:
-                break  # Last page
+                return  # Last page
 
-            offset += _PAGE_SIZE
+            last = tuple(rows[-1][col] for col in key_cols)
 
-        return all_rows
+    def _keyset_select(
+        self,
+        table: str,
+        key_cols: tuple[str, ...],
+        select: str = "*",
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """Fetch all rows using keyset (cursor) pagination.
+
+        Same arguments as :meth:`_keyset_pages`, with the pages flattened.
+
+        Returns:
+            List of row dicts ordered by key_cols.
+        """
+        pages = self._keyset_pages(table, key_cols, select, filters)
+        return [row for page in pages for row in page]
+
+    def _upsert_batches(
+        self,
+        table: str,
+        rows: list[dict],
+        on_conflict: str,
+        ignore_duplicates: bool = False,
+        written: Optional[list[dict]] = None,
+    ) -> list[list[dict]]:
+        """Upsert rows in ``_BATCH_SIZE`` chunks, sending chunks concurrently.
+
+        Args:
+            table: Table name.
+            rows: Row dicts to upsert.
+            on_conflict: Comma-separated conflict target columns.
+            ignore_duplicates: If True, skip rows that already exist.
+            written: If given, the rows Supabase echoes back are appended to
+                it. With ignore_duplicates that is only the newly inserted
+                rows (``ON CONFLICT DO NOTHING ... RETURNING``). Otherwise
+                the upsert is sent with ``Prefer: return=minimal`` and the
+                response has no body.
+
+        Returns:
+            List of batches that failed (empty if everything succeeded).
+        """
+        batches = [rows[i : i + _BATCH_SIZE] for i in range(0, len(rows), _BATCH_SIZE)]
+        returning = "representation" if written is not None else "minimal"
+
+        def send(batch: list[dict]) -> bool:
+            try:
+                result = _execute(
+                    self._client.table(table).upsert(
+                        batch,
+                        on_conflict=on_conflict,
+                        ignore_duplicates=ignore_duplicates,
+                        returning=returning,
+                    )
+                )
+                if written is not None:
+                    written.extend(result.data or [])
+                return True
+            except Exception as exc:
+                logger.error("Upsert batch into %s failed: %s", table, exc)
+                return False
+
+        if len(batches) <= 1:
+            results = [send(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(batches))) as pool:
+                results = list(pool.map(send, batches))
+
+        return [b for b, ok in zip(batches, results) if not ok]
 
     # ------------------------------------------------------------------
     # Tender upsert
@@ -174,6 +691,11 @@ class TenderDB:
     ) -> None:
         """Insert or update tenders and write a history snapshot row.
 
+        Tenders whose content hash matches the stored one are not re-sent;
+        only their ``last_updated`` is bumped. Every tender writer sets
+        ``last_updated``, so it marks the last refresh or write of each row
+        (see :meth:`get_tenders_freshness_token`).
+
         Args:
             df: DataFrame with normalized tender columns.
             snapshot_date: ISO date string for the history entry.
@@ -189,78 +711,149 @@ class TenderDB:
         snapshot_date = snapshot_date or date.today().isoformat()
         now = datetime.now().isoformat()
 
-        # Build tender rows + history rows
-        tender_rows: list[dict] = []
-        history_rows: list[dict] = []
-
-        for _, row in df.iterrows():
-            tender_id = int(row.get("tender_id", 0))
-            if not tender_id:
-                continue
-
-            tender_row = {
-                "tender_id": tender_id,
-                "tender_name": _clean_val(row.get("tender_name")),
-                "city_code": _clean_val(row.get("city_code")),
-                "city": _clean_val(row.get("city")),
-                "region": _clean_val(row.get("region")),
-                "location": _clean_val(row.get("location")),
-                "tender_type_code": _clean_val(row.get("tender_type_code")),
-                "tender_type": _clean_val(row.get("tender_type")),
-                "purpose_code": _clean_val(row.get("purpose_code")),
-                "purpose": _clean_val(row.get("purpose")),
-                "status_code": _clean_val(row.get("status_code")),
-                "status": _clean_val(row.get("status")),
-                "units": _clean_val(row.get("units")),
-                "publish_date": _clean_val(row.get("publish_date")),
-                "deadline": _clean_val(row.get("deadline")),
-                "committee_date": _clean_val(row.get("committee_date")),
-                "published_booklet": _clean_val(row.get("published_booklet")),
-                "targeted": _clean_val(row.get("targeted")),
-                "area_sqm": _clean_val(row.get("area_sqm")),
-                "min_price": _clean_val(row.get("min_price")),
-                "gush": _clean_val(row.get("gush")),
-                "helka": _clean_val(row.get("helka")),
-                "last_updated": now,
+        # Project to the table's columns (missing ones become NULL) and drop
+        # rows without a tender ID, then serialize column-wise
+        frame = df.reindex(columns=TENDER_COLUMNS)
+        ids = pd.to_numeric(frame["tender_id"], errors="coerce").fillna(0).astype("int64")
+        frame = frame.assign(tender_id=ids)[ids.to_numpy() != 0]
+
+        tender_rows = _frame_records(frame)
+
+        # Fingerprint each row so unchanged tenders can be skipped below
+        stored_hashes = self._stored_content_hashes()
+        if stored_hashes is not None:
+            for r in tender_rows:
+                r["content_hash"] = _content_hash(r)
+            changed = [
+                stored_hashes.get(r["tender_id"]) != r["content_hash"]
+                for r in tender_rows
+            ]
+        for r in tender_rows:
+            r["last_updated"] = now
+
+        # Project from the already-cleaned tender rows
+        history_rows = [
+            {
+                "tender_id": r["tender_id"],
+                "snapshot_date": snapshot_date,
+                "status_code": r["status_code"],
+                "status": r["status"],
+                "units": r["units"],
+                "deadline": r["deadline"],
             }
-            tender_rows.append(tender_row)
+            for r in tender_rows
+        ]
+
+        # Batch upsert tenders whose content changed (history is always written)
+        unchanged_ids: list[int] = []
+        if stored_hashes is not None:
+            unchanged_ids = [r["tender_id"] for r, c in zip(tender_rows, changed) if not c]
+            tender_rows = [r for r, c in zip(tender_rows, changed) if c]
+        failed = self._upsert_batches("tenders", tender_rows, on_conflict="tender_id")
+        inserted = len(tender_rows) - sum(len(b) for b in failed)
+
+        # Unchanged tenders were still seen in this refresh
+        self._touch_tenders(unchanged_ids, now)
+        unchanged = len(unchanged_ids)
+
+        # Re-runs on the same day would only send rows the server discards;
+        # drop the tenders that already have a row for this snapshot date
+        existing = self._keyset_select(
+            "tender_history",
+            key_cols=("tender_id",),
+            select="tender_id",
+            filters={"snapshot_date": snapshot_date},
+        )
+        if existing:
+            existing_ids = {r["tender_id"] for r in existing}
+            history_rows = [r for r in history_rows if r["tender_id"] not in existing_ids]
 
-            history_rows.append({
-                "tender_id": tender_id,
-                "snapshot_date": snapshot_date,
-                "status_code": _clean_val(row.get("status_code")),
-                "status": _clean_val(row.get("status")),
-                "units": _clean_val(row.get("units")),
-                "deadline": _clean_val(row.get("deadline")),
-            })
-
-        # Batch upsert tenders
-        inserted = 0
-        for i in range(0, len(tender_rows), _BATCH_SIZE):
-            batch = tender_rows[i : i + _BATCH_SIZE]
-            try:
-                self._client.table("tenders").upsert(
-                    batch,
-                    on_conflict="tender_id",
-                ).execute()
-                inserted += len(batch)
-            except Exception as exc:
-                logger.error("upsert_tenders batch failed: %s", exc)
+        if history_rows:
+            self._insert_history(history_rows)
+
+        logger.info(
+            "Upserted %d tenders, %d unchanged (snapshot %s)",
+            inserted, unchanged, snapshot_date,
+        )
+
+    def _touch_tenders(self, tender_ids: list[int], now: str) -> None:
+        """Set ``last_updated`` on tenders skipped as unchanged by upsert_tenders.
+
+        Keeps ``last_updated`` meaning "last seen in a refresh" for every row,
+        with one small UPDATE ... WHERE tender_id IN (...) per batch instead of
+        re-sending the full rows.
+
+        Args:
+            tender_ids: IDs whose content hash matched the stored one.
+            now: ISO timestamp of this refresh.
+        """
+        batches = [
+            tender_ids[i : i + _BATCH_SIZE] for i in range(0, len(tender_ids), _BATCH_SIZE)
+        ]
 
-        # Batch upsert history (ignore duplicates for same tender+date)
-        for i in range(0, len(history_rows), _BATCH_SIZE):
-            batch = history_rows[i : i + _BATCH_SIZE]
+        def send(batch: list[int]) -> None:
             try:
-                self._client.table("tender_history").upsert(
-                    batch,
-                    on_conflict="tender_id,snapshot_date",
-                    ignore_duplicates=True,
-                ).execute()
+                _execute(
+                    self._client.table("tenders")
+                    .update({"last_updated": now}, returning="minimal")
+                    .in_("tender_id", batch)
+                )
             except Exception as exc:
-                logger.error("upsert_history batch failed: %s", exc)
+                logger.error("Refreshing last_updated for %d tenders failed: %s", len(batch), exc)
 
-        logger.info(
-            "Upserted %d tenders (snapshot %s)", inserted, snapshot_date,
+        if len(batches) <= 1:
+            for b in batches:
+                send(b)
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(batches))) as pool:
+                list(pool.map(send, batches))
+
+    def _stored_content_hashes(self) -> Optional[dict[int, str]]:
+        """Fetch the stored ``content_hash`` of every tender.
+
+        Returns:
+            Dict mapping tender_id to its hash, or None if the column is not
+            deployed (see ``scripts/sql/rpc_functions.sql``) — upsert_tenders
+            then writes every row without a hash.
+        """
+        try:
+            _execute(
+                self._client.table("tenders").select("content_hash").limit(1),
+                max_retries=_INTERACTIVE_RETRIES,
+            )
+        except Exception as exc:
+            logger.warning("tenders.content_hash unavailable, upserting all rows: %s", exc)
+            return None
+
+        rows = self._paginated_select(
+            "tenders", select="tender_id, content_hash", order_col="tender_id",
+        )
+        return {r["tender_id"]: r["content_hash"] for r in rows}
+
+    def _insert_history(self, history_rows: list[dict]) -> None:
+        """Write history snapshot rows, skipping (tender_id, snapshot_date) dupes.
+
+        Uses the ``bulk_insert_history`` RPC (see
+        ``scripts/sql/rpc_functions.sql``) so the whole snapshot is one
+        request and one set-based INSERT. Falls back to batched upserts if
+        the RPC is missing.
+
+        Args:
+            history_rows: Cleaned tender_history row dicts.
+        """
+        try:
+            _execute(self._client.rpc("bulk_insert_history", {"rows": history_rows}))
+            return
+        except Exception as exc:
+            logger.warning(
+                "bulk_insert_history RPC unavailable, using batched upserts: %s", exc,
+            )
+
+        self._upsert_batches(
+            "tender_history",
+            history_rows,
+            on_conflict="tender_id,snapshot_date",
+            ignore_duplicates=True,
         )
 
     # ------------------------------------------------------------------
@@ -271,68 +864,95 @@ class TenderDB:
         self,
         tender_id: int,
         doc_list: list[dict],
+        first_seen: Optional[str] = None,
     ) -> list[dict]:
         """Insert new documents for a tender. Returns newly added docs.
 
+        Thin wrapper around :meth:`upsert_documents_bulk` for single-tender
+        callers.
+
         Args:
             tender_id: The tender's MichrazID.
             doc_list: List of document dicts from the API (MichrazDocList items).
+            first_seen: ISO date stamped on new rows. Defaults to today;
+                callers looping over tenders can compute it once and pass it.
 
         Returns:
             List of document dicts that were newly inserted.
         """
-        if not doc_list or not self._client:
+        if not doc_list:
             return []
+        return self.upsert_documents_bulk(
+            {tender_id: doc_list}, first_seen=first_seen,
+        ).get(tender_id, [])
+
+    def upsert_documents_bulk(
+        self,
+        docs_by_tender: dict[int, list[dict]],
+        first_seen: Optional[str] = None,
+    ) -> dict[int, list[dict]]:
+        """Insert new documents for many tenders in batched requests.
 
-        today_str = date.today().isoformat()
+        Every document is sent as an ``ON CONFLICT DO NOTHING`` upsert and
+        Postgres returns only the rows it actually inserted, so new documents
+        are detected in the same round trip — no existence lookup first.
 
-        # Get existing row_ids for this tender to detect truly new docs
-        try:
-            existing_result = (
-                self._client.table("tender_documents")
-                .select("row_id")
-                .eq("tender_id", tender_id)
-                .execute()
-            )
-            existing_ids = {r["row_id"] for r in (existing_result.data or [])}
-        except Exception as exc:
-            logger.error("Failed to check existing docs for tender %d: %s", tender_id, exc)
-            existing_ids = set()
+        Args:
+            docs_by_tender: Dict mapping tender_id to its API document list
+                (MichrazDocList items).
+            first_seen: ISO date stamped on new rows. Defaults to today.
 
-        new_docs: list[dict] = []
+        Returns:
+            Dict mapping tender_id to the document dicts newly inserted.
+            Tenders with no new documents are omitted.
+        """
+        docs_by_tender = {tid: docs for tid, docs in docs_by_tender.items() if docs}
+        if not docs_by_tender or not self._client:
+            return {}
+
+        first_seen = first_seen or date.today().isoformat()
         rows_to_insert: list[dict] = []
+        docs_by_key: dict[tuple[int, object], dict] = {}
+        clean = _clean_val
 
-        for doc in doc_list:
-            row_id = doc.get("RowID")
-            if row_id is None or row_id in existing_ids:
-                continue
-
-            rows_to_insert.append({
-                "tender_id": tender_id,
-                "row_id": row_id,
-                "doc_name": doc.get("DocName"),
-                "description": doc.get("Teur"),
-                "file_type": doc.get("FileType"),
-                "size": doc.get("Size"),
-                "pirsum_type": doc.get("PirsumType"),
-                "update_date": _clean_val(doc.get("UpdateDate")),
-                "first_seen": today_str,
-            })
-            new_docs.append(doc)
-
-        if rows_to_insert:
-            try:
-                self._client.table("tender_documents").upsert(
-                    rows_to_insert,
-                    on_conflict="tender_id,row_id",
-                    ignore_duplicates=True,
-                ).execute()
-                logger.info(
-                    "Tender %d: %d new documents added", tender_id, len(new_docs),
-                )
-            except Exception as exc:
-                logger.error("upsert_documents failed for tender %d: %s", tender_id, exc)
-                return []
+        for tender_id, doc_list in docs_by_tender.items():
+            for doc in doc_list:
+                row_id = doc.get("RowID")
+                if row_id is None or (tender_id, row_id) in docs_by_key:
+                    continue
+                docs_by_key[(tender_id, row_id)] = doc
+
+                rows_to_insert.append({
+                    "tender_id": tender_id,
+                    "row_id": row_id,
+                    "doc_name": doc.get("DocName"),
+                    "description": doc.get("Teur"),
+                    "file_type": doc.get("FileType"),
+                    "size": doc.get("Size"),
+                    "pirsum_type": doc.get("PirsumType"),
+                    "update_date": clean(doc.get("UpdateDate")),
+                    "first_seen": first_seen,
+                })
+
+        # Existing rows are skipped server-side and not echoed back; a failed
+        # batch echoes nothing, so its documents are not reported as new
+        inserted: list[dict] = []
+        self._upsert_batches(
+            "tender_documents",
+            rows_to_insert,
+            on_conflict="tender_id,row_id",
+            ignore_duplicates=True,
+            written=inserted,
+        )
+
+        new_docs: dict[int, list[dict]] = {}
+        for row in inserted:
+            doc = docs_by_key.get((row["tender_id"], row["row_id"]))
+            if doc is not None:
+                new_docs.setdefault(row["tender_id"], []).append(doc)
+
+        for tender_id, docs in new_docs.items():
+            logger.info("Tender %d: %d new documents added", tender_id, len(docs))
 
         return new_docs
 
@@ -342,26 +962,35 @@ class TenderDB:
 
     def load_current_tenders(self) -> pd.DataFrame:
         """Load all tenders from Supabase as a DataFrame."""
-        rows = self._paginated_select("tenders", order_col="tender_id")
+        df = _pages_to_frame(self._paginated_pages(
+            "tenders", order_col="tender_id", max_retries=_INTERACTIVE_RETRIES,
+        ))
 
-        if not rows:
+        if df.empty:
             logger.warning("No tenders loaded from Supabase")
             return pd.DataFrame()
 
-        df = pd.DataFrame(rows)
+        # Write-side change detection only; not part of the tender data
+        df = df.drop(columns="content_hash", errors="ignore")
+
         logger.info("Loaded %d tenders from Supabase", len(df))
 
         # Convert date columns to tz-naive datetime (Supabase returns UTC-aware
         # strings, but the dashboard uses datetime.now() which is tz-naive).
-        for col in ("publish_date", "deadline", "committee_date"):
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
-                df[col] = df[col].dt.tz_localize(None)
+        date_cols = [c for c in _DATE_COLUMNS if c in df.columns]
+        if date_cols:
+            df[date_cols] = df[date_cols].apply(_to_naive_datetime)
 
         # Convert boolean-like columns
         if "published_booklet" in df.columns:
             df["published_booklet"] = df["published_booklet"].astype(bool)
 
+        # Label columns hold a few dozen distinct values across thousands of
+        # rows; category dtype shrinks them and speeds up groupby/isin.
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+
         return df
 
     def load_tender_history(
@@ -377,12 +1006,12 @@ class TenderDB:
             DataFrame with history rows.
         """
         filters = {"tender_id": tender_id} if tender_id is not None else None
-        rows = self._paginated_select(
+        pages = self._keyset_pages(
             "tender_history",
+            key_cols=("snapshot_date", "tender_id"),
             filters=filters,
-            order_col="snapshot_date",
         )
-        return pd.DataFrame(rows) if rows else pd.DataFrame()
+        return _pages_to_frame(pages)
 
     def load_tender_documents(self, tender_id: int) -> pd.DataFrame:
         """Load all documents for a specific tender.
@@ -393,18 +1022,20 @@ class TenderDB:
         Returns:
             DataFrame with document rows.
         """
-        rows = self._paginated_select(
+        pages = self._paginated_pages(
             "tender_documents",
             filters={"tender_id": tender_id},
             order_col="update_date",
         )
-        return pd.DataFrame(rows) if rows else pd.DataFrame()
+        return _pages_to_frame(pages)
 
     def get_new_documents(self, since_date: str) -> pd.DataFrame:
         """Get all documents first seen after a given date, with tender info.
 
-        Note: Supabase REST API doesn't support JOINs natively, so we fetch
-        documents and tenders separately, then merge in Python.
+        Reads the ``v_new_documents`` view (see
+        ``scripts/sql/rpc_functions.sql``), which joins tender_documents with
+        tenders server-side. Falls back to fetching documents and tenders
+        separately and merging in Python if the view is missing.
 
         Args:
             since_date: ISO date string (e.g. "2026-02-16").
@@ -416,52 +1047,59 @@ class TenderDB:
             return pd.DataFrame()
 
         try:
-            # Fetch documents with first_seen > since_date (paginated)
-            all_docs: list[dict] = []
-            offset = 0
-            while True:
-                result = (
-                    self._client.table("tender_documents")
-                    .select("*")
-                    .gt("first_seen", since_date)
-                    .order("first_seen", desc=True)
-                    .range(offset, offset + _PAGE_SIZE - 1)
-                    .execute()
-                )
-                rows = result.data or []
-                all_docs.extend(rows)
-                if len(rows) < _PAGE_SIZE:
-                    break
-                offset += _PAGE_SIZE
+            _execute(
+                self._client.table("v_new_documents").select("tender_id").limit(1),
+                max_retries=_INTERACTIVE_RETRIES,
+            )
+        except Exception as exc:
+            logger.warning(
+                "v_new_documents view unavailable, joining client-side: %s", exc,
+            )
+            return self._join_new_documents(since_date)
 
-            if not all_docs:
-                return pd.DataFrame()
+        pages = self._paginated_pages(
+            "v_new_documents",
+            gt_filters={"first_seen": since_date},
+            order_col="first_seen",
+            order_desc=True,
+        )
+        return _pages_to_frame(pages)
+
+    def _join_new_documents(self, since_date: str) -> pd.DataFrame:
+        """Client-side fallback for get_new_documents (no v_new_documents view).
 
-            docs_df = pd.DataFrame(all_docs)
+        Args:
+            since_date: ISO date string (e.g. "2026-02-16").
+
+        Returns:
+            DataFrame with document rows plus tender_name, city, region.
+        """
+        docs_df = _pages_to_frame(self._paginated_pages(
+            "tender_documents",
+            gt_filters={"first_seen": since_date},
+            order_col="first_seen",
+            order_desc=True,
+        ))
+        if docs_df.empty:
+            return docs_df
 
-            # Fetch tender info for the matching tender_ids
+        try:
             tender_ids = docs_df["tender_id"].unique().tolist()
             tender_info: list[dict] = []
             for i in range(0, len(tender_ids), _BATCH_SIZE):
-                batch_ids = tender_ids[i : i + _BATCH_SIZE]
-                result = (
+                result = _execute(
                     self._client.table("tenders")
                     .select("tender_id, tender_name, city, region")
-                    .in_("tender_id", batch_ids)
-                    .execute()
+                    .in_("tender_id", tender_ids[i : i + _BATCH_SIZE])
                 )
                 tender_info.extend(result.data or [])
-
-            if tender_info:
-                tenders_df = pd.DataFrame(tender_info)
-                merged = docs_df.merge(tenders_df, on="tender_id", how="left")
-                return merged
-
+        except Exception as exc:
+            logger.error("get_new_documents tender lookup failed: %s", exc)
             return docs_df
 
-        except Exception as exc:
-            logger.error("get_new_documents failed: %s", exc)
-            return pd.DataFrame()
+        if not tender_info:
+            return docs_df
+        return docs_df.merge(pd.DataFrame(tender_info), on="tender_id", how="left")
 
     def get_tender_by_id(self, tender_id: int) -> Optional[dict]:
         """Look up a single tender by ID.
@@ -476,12 +1114,12 @@ class TenderDB:
             return None
 
         try:
-            result = (
+            result = _execute(
                 self._client.table("tenders")
                 .select("*")
                 .eq("tender_id", tender_id)
-                .limit(1)
-                .execute()
+                .limit(1),
+                max_retries=_INTERACTIVE_RETRIES,
             )
             rows = result.data or []
             return rows[0] if rows else None
@@ -503,9 +1141,14 @@ class TenderDB:
             return False
 
         try:
-            self._client.table("tenders").update(
-                {"plan_number": plan_number}
-            ).eq("tender_id", tender_id).execute()
+            _execute(
+                self._client.table("tenders")
+                .update({
+                    "plan_number": plan_number,
+                    "last_updated": datetime.now().isoformat(),
+                })
+                .eq("tender_id", tender_id)
+            )
             logger.info("Stored plan_number=%s for tender %d", plan_number, tender_id)
             return True
         except Exception as exc:
@@ -515,6 +1158,10 @@ class TenderDB:
     def get_snapshot_dates(self) -> list[str]:
         """List all unique snapshot dates in the history table.
 
+        Uses the ``distinct_snapshot_dates`` RPC (see
+        ``scripts/sql/rpc_functions.sql``) so Postgres does the dedup. Falls
+        back to scanning the snapshot_date column if the RPC is missing.
+
         Returns:
             Sorted list of ISO date strings.
         """
@@ -522,28 +1169,20 @@ class TenderDB:
             return []
 
         try:
-            # Fetch snapshot_date column (paginated), deduplicate in Python
-            all_rows: list[dict] = []
-            offset = 0
-            while True:
-                result = (
-                    self._client.table("tender_history")
-                    .select("snapshot_date")
-                    .order("snapshot_date")
-                    .range(offset, offset + _PAGE_SIZE - 1)
-                    .execute()
-                )
-                rows = result.data or []
-                all_rows.extend(rows)
-                if len(rows) < _PAGE_SIZE:
-                    break
-                offset += _PAGE_SIZE
-
-            dates = sorted({r["snapshot_date"] for r in all_rows if r.get("snapshot_date")})
-            return dates
+            result = _execute(self._client.rpc("distinct_snapshot_dates"))
+            rows = result.data or []
+            return sorted({r["snapshot_date"] for r in rows if r.get("snapshot_date")})
         except Exception as exc:
-            logger.error("get_snapshot_dates failed: %s", exc)
-            return []
+            logger.warning(
+                "distinct_snapshot_dates RPC unavailable, scanning history: %s", exc,
+            )
+
+        rows = self._keyset_select(
+            "tender_history",
+            key_cols=("snapshot_date", "tender_id"),
+            select="snapshot_date, tender_id",
+        )
+        return sorted({r["snapshot_date"] for r in rows if r.get("snapshot_date")})
 
     def get_new_docs_excluding(
         self,
@@ -567,13 +1206,12 @@ class TenderDB:
             return []
 
         try:
-            result = (
+            result = _execute(
                 self._client.table("tender_documents")
                 .select("row_id, doc_name, description, file_type, size, pirsum_type, update_date, first_seen")
                 .eq("tender_id", tender_id)
                 .gt("first_seen", since_date)
                 .order("first_seen", desc=True)
-                .execute()
             )
             rows = result.data or []
             return [r for r in rows if r["row_id"] not in exclude_row_ids]
@@ -581,6 +1219,36 @@ class TenderDB:
             logger.error("get_new_docs_excluding failed: %s", exc)
             return []
 
+    def get_tenders_freshness_token(self) -> Optional[str]:
+        """Return a cheap token that changes whenever the tenders table does.
+
+        One request returns both the row count and the newest
+        ``last_updated``: every tender writer sets ``last_updated``, and the
+        count catches deletes. Callers use it as a cache key so a cached
+        tenders frame is reloaded only after a write.
+
+        Returns:
+            ``"<count>:<max last_updated>"``, or None if it cannot be read.
+        """
+        if not self._client:
+            return None
+
+        try:
+            result = _execute(
+                self._client.table("tenders")
+                .select("last_updated", count="exact")
+                .not_.is_("last_updated", "null")
+                .order("last_updated", desc=True)
+                .limit(1),
+                max_retries=_INTERACTIVE_RETRIES,
+            )
+        except Exception as exc:
+            logger.warning("Could not read tenders freshness token: %s", exc)
+            return None
+
+        newest = result.data[0]["last_updated"] if result.data else ""
+        return f"{result.count}:{newest}"
+
     def get_stats(self) -> dict:
         """Get summary counts for logging/debugging.
 
@@ -590,14 +1258,20 @@ class TenderDB:
         if not self._client:
             return {}
 
+        # HEAD request: PostgREST returns only the Content-Range count header
+        count_cols = {
+            "tenders": "tender_id",
+            "tender_history": "tender_id",
+            "tender_documents": "tender_id",
+            "building_rights": "plan_number",
+        }
         stats = {}
-        for table in ("tenders", "tender_history", "tender_documents", "building_rights"):
+        for table, col in count_cols.items():
             try:
-                result = (
+                result = _execute(
                     self._client.table(table)
-                    .select("*", count="exact")
-                    .limit(0)
-                    .execute()
+                    .select(col, count="exact", head=True),
+                    max_retries=_INTERACTIVE_RETRIES,
                 )
                 stats[table] = result.count if result.count is not None else 0
             except Exception as exc:
@@ -649,6 +1323,10 @@ class TenderDB:
         "balcony_area": "balcony_area",
     }
 
+    # Extractor field → (column, cleaner), so the per-field loop in
+    # upsert_building_rights is a single dict lookup.
+    _RIGHTS_FIELD_ACTIONS = _field_actions(_RIGHTS_FIELD_MAP, _BUILDING_RIGHTS_INT_COLS)
+
     def upsert_building_rights(
         self,
         plan_number: str,
@@ -671,6 +1349,7 @@ class TenderDB:
         if not rows or not self._client:
             return 0
 
+        actions = self._RIGHTS_FIELD_ACTIONS
         db_rows: list[dict] = []
         for idx, row in enumerate(rows):
             db_row: dict = {
@@ -683,18 +1362,12 @@ class TenderDB:
             for src_field, value in row.items():
                 if src_field.startswith("_"):
                     continue
-                db_col = self._RIGHTS_FIELD_MAP.get(src_field)
-                if db_col:
-                    cleaned = _clean_val(value)
-                    # Cast float → int for INT columns (e.g. 3.0 → 3)
-                    if (
-                        db_col in self._BUILDING_RIGHTS_INT_COLS
-                        and isinstance(cleaned, float)
-                    ):
-                        cleaned = int(cleaned)
-                    db_row[db_col] = cleaned
+                action = actions.get(src_field)
+                if action:
+                    db_col, clean = action
+                    db_row[db_col] = clean(value)
                 else:
-                    extra[src_field] = _clean_val(value)
+                    extra[src_field] = _to_jsonable(value)
 
             if extra:
                 db_row["extra_data"] = extra
@@ -702,20 +1375,17 @@ class TenderDB:
             db_rows.append(db_row)
 
         # Batch upsert
-        inserted = 0
-        for i in range(0, len(db_rows), _BATCH_SIZE):
-            batch = db_rows[i : i + _BATCH_SIZE]
-            try:
-                self._client.table("building_rights").upsert(
-                    batch,
-                    on_conflict="plan_number,plan_status,row_index",
-                ).execute()
-                inserted += len(batch)
-            except Exception as exc:
-                logger.error(
-                    "upsert_building_rights failed for %s: %s",
-                    plan_number, exc,
-                )
+        failed = self._upsert_batches(
+            "building_rights",
+            db_rows,
+            on_conflict="plan_number,plan_status,row_index",
+        )
+        if failed:
+            logger.error(
+                "upsert_building_rights: %d batch(es) failed for %s",
+                len(failed), plan_number,
+            )
+        inserted = len(db_rows) - sum(len(b) for b in failed)
 
         if inserted:
             logger.info(
@@ -746,6 +1416,7 @@ class TenderDB:
             "building_rights",
             filters=filters,
             order_col="row_index",
+            max_retries=_INTERACTIVE_RETRIES,
         )
 
     # ------------------------------------------------------------------
@@ -775,21 +1446,22 @@ class TenderDB:
         if not self._client:
             return False
 
-        import json as _json
-
         update_data: dict = {
             "brochure_summary": brochure_summary or None,
-            "lots_data": _json.loads(_json.dumps(lots_data, default=str)) if lots_data else {},
+            "lots_data": _to_jsonable(lots_data) if lots_data else {},
             "extraction_status": extraction_status,
             "extraction_error": None,
+            "last_updated": datetime.now().isoformat(),
         }
         if plan_number:
             update_data["plan_number"] = plan_number
 
         try:
-            self._client.table("tenders").update(
-                update_data,
-            ).eq("tender_id", tender_id).execute()
+            _execute(
+                self._client.table("tenders")
+                .update(update_data)
+                .eq("tender_id", tender_id)
+            )
             logger.info(
                 "Stored brochure data for tender %d (status=%s, plan=%s)",
                 tender_id, extraction_status, plan_number,
@@ -819,16 +1491,21 @@ class TenderDB:
         if not self._client:
             return False
 
-        update_data: dict = {"extraction_status": status}
+        update_data: dict = {
+            "extraction_status": status,
+            "last_updated": datetime.now().isoformat(),
+        }
         if error is not None:
             update_data["extraction_error"] = error
         elif status != "failed":
             update_data["extraction_error"] = None
 
         try:
-            self._client.table("tenders").update(
-                update_data,
-            ).eq("tender_id", tender_id).execute()
+            _execute(
+                self._client.table("tenders")
+                .update(update_data)
+                .eq("tender_id", tender_id)
+            )
             logger.info("Set extraction_status=%s for tender %d", status, tender_id)
             return True
         except Exception as exc:
@@ -839,7 +1516,9 @@ class TenderDB:
         """Get tenders queued for building rights extraction.
 
         Returns tenders where extraction_status == 'queued' and
-        plan_number is set.
+        plan_number is set, in tender_id order. The filter matches the
+        partial index ``idx_tenders_extraction_queued`` (see
+        ``scripts/sql/rpc_functions.sql``).
 
         Returns:
             List of tender dicts with tender_id and plan_number.
@@ -848,12 +1527,12 @@ class TenderDB:
             return []
 
         try:
-            result = (
+            result = _execute(
                 self._client.table("tenders")
                 .select("tender_id, plan_number, extraction_status")
                 .eq("extraction_status", "queued")
                 .not_.is_("plan_number", "null")
-                .execute()
+                .order("tender_id")
             )
             rows = result.data or []
             logger.info("Found %d tenders queued for extraction", len(rows))
@@ -1,47 +1,60 @@
 """
 Extract city code to region mapping from the Excel file
 """
-import pandas as pd
-
-print("Reading Excel file...")
-df = pd.read_excel('bycode2021 (1).xlsx')
+import json
+from pathlib import Path
 
-# Column B (index 1) has codes, Column E (index 4) has regions
-code_col = df.iloc[:, 1]  # Column B - codes
-region_col = df.iloc[:, 4]  # Column E - regions
+import pandas as pd
 
-# Build mapping
-city_region_map = {}
-for code, region in zip(code_col, region_col):
-    if pd.notna(code) and pd.notna(region):
-        try:
-            code_int = int(code)
-            city_region_map[code_int] = region
-        except (ValueError, TypeError):
-            pass
+# python-calamine (Rust) parses xlsx far faster than openpyxl; use it if installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None  # pandas default (openpyxl)
+
+SOURCE = Path('bycode2021 (1).xlsx')
+# Cleaned (code, region) pairs, reused until the workbook changes
+CACHE = Path('bycode2021.parquet')
+
+if CACHE.exists() and CACHE.stat().st_mtime >= SOURCE.stat().st_mtime:
+    print(f"Reading cached mapping from {CACHE}...")
+    sub = pd.read_parquet(CACHE)
+else:
+    print("Reading Excel file...")
+    # Only column B (codes) and column E (regions) are needed
+    df = pd.read_excel(SOURCE, engine=EXCEL_ENGINE, usecols=[1, 4])
+
+    # Build mapping: drop rows missing either value or with a non-numeric code
+    sub = df.dropna().set_axis(['code', 'region'], axis=1)
+    sub = sub.assign(code=pd.to_numeric(sub['code'], errors='coerce')).dropna(subset=['code'])
+    sub = sub.astype({'code': 'int64'}).drop_duplicates('code', keep='last')
+    try:
+        sub.to_parquet(CACHE, index=False)
+    except (ImportError, ValueError, TypeError) as exc:
+        print(f"[WARN] Could not cache mapping to {CACHE}: {exc}")
+
+city_region_map = dict(zip(sub['code'].tolist(), sub['region'].tolist()))
 
 print(f"\nExtracted {len(city_region_map)} code-to-region mappings")
 
-# Show region distribution
-from collections import Counter
-region_counts = Counter(city_region_map.values())
+# Show region distribution (value_counts returns it sorted, most common first)
+region_counts = sub['region'].value_counts()
 
 print("\nRegion distribution:")
-for region, count in sorted(region_counts.items(), key=lambda x: x[1], reverse=True):
+for region, count in region_counts.items():
     print(f"  {region}: {count} settlements")
 
-# Save to Python file
-output = "# Israeli settlement code to region mapping\n"
-output += "# Extracted from CBS data (bycode2021.xlsx)\n\n"
-output += "city_region_map = {\n"
-
-for code in sorted(city_region_map.keys()):
-    region = city_region_map[code]
-    # Escape quotes
-    region_escaped = region.replace('\\', '\\\\').replace('"', '\\"')
-    output += f"    {code}: \"{region_escaped}\",\n"
-
-output += "}\n"
+# Save to Python file (a JSON string literal is also a valid Python literal)
+lines = [
+    f"    {code}: {json.dumps(region, ensure_ascii=False)},"
+    for code, region in sorted(city_region_map.items())
+]
+output = (
+    "# Israeli settlement code to region mapping\n"
+    "# Extracted from CBS data (bycode2021.xlsx)\n\n"
+    "city_region_map = {\n" + "\n".join(lines) + "\n}\n"
+)
 
 with open('complete_city_regions.py', 'w', encoding='utf-8') as f:
     f.write(output)
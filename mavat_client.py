@@ -19,18 +19,36 @@ Flow:
 Usage:
     from mavat_client import MavatClient
 
-    client = MavatClient()
-    result = client.download_horaot("102-0909267")
+    with MavatClient() as client:
+        result = client.download_horaot("102-0909267")
     print(result)  # {"status": "success", "file_path": "tmp/mavat_plans/102-0909267.zip", ...}
+
+One Chromium process is launched lazily and shared by every call on a client;
+each call gets its own fresh browser context. All browser work runs on the
+client's own thread, so a client can be shared or closed from any thread.
+Call close() (or use the client as a context manager) when done.
 """
 
+import functools
 import logging
+import shutil
+import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-
-from playwright.sync_api import sync_playwright, Page
+from typing import Any, Callable, Iterator, Optional
+
+from playwright.sync_api import (
+    Browser,
+    Locator,
+    Page,
+    Playwright,
+    Route,
+    TimeoutError as PlaywrightTimeoutError,
+    sync_playwright,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -41,6 +59,32 @@ logger = logging.getLogger(__name__)
 MAVAT_SEARCH_URL = "https://mavat.iplan.gov.il/SV1"
 MAVAT_PLAN_URL_TEMPLATE = "https://mavat.iplan.gov.il/SV4/1/{mp_id}/310"
 
+# Relaunch Chromium after this many contexts to shed native memory drift
+BROWSER_RECYCLE_AFTER = 100
+
+# Resource types the scraper never needs; XHR/fetch (the search API),
+# scripts and stylesheets (layout the visibility waits depend on) still load
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Failure screenshots kept in output_dir/debug (oldest are deleted)
+MAX_DEBUG_SCREENSHOTS = 50
+
+
+def _on_browser_thread(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Run a MavatClient method on the client's own browser thread.
+
+    Playwright's sync API only works on the thread that started it, so
+    funnelling every browser call through one worker thread lets a client be
+    used, and closed, from any thread.
+    """
+    @functools.wraps(method)
+    def wrapper(self: "MavatClient", *args: Any, **kwargs: Any) -> Any:
+        if threading.get_ident() == self._browser_thread_id:
+            return method(self, *args, **kwargs)
+        return self._browser_thread.submit(method, self, *args, **kwargs).result()
+
+    return wrapper
+
 
 class MavatClient:
     """Fetches zoning plan documents from mavat.iplan.gov.il.
@@ -49,21 +93,134 @@ class MavatClient:
     search for plans by number, and download הוראות (instruction) documents.
     """
 
+    # Plan page selectors used by the click-through flow
+    DOCS_SEL = "text=מסמכי התכנית"
+    APPROVED_SEL = "text=מסמכים מאושרים"
+    IN_PROCESS_SEL = "text=מסמכים בתהליך"
+    # Matched exactly: "text=הוראות" also matches "עיקר הוראותיה"
+    HORAOT_TEXT = "הוראות"
+    PDF_DOWNLOAD_SEL = "img.pdf-download"
+    PDF_DOWNLOAD_SRC_SEL = "img[src*='pdf-download']"
+
     def __init__(
         self,
         headless: bool = True,
         output_dir: Path = Path("tmp/mavat_plans"),
+        debug: bool = False,
+        block_resources: bool = True,
     ) -> None:
         """Initialize the mavat client.
 
         Args:
             headless: Run browser in headless mode (set False for debugging).
             output_dir: Directory to save downloaded documents.
+            debug: Also screenshot successful steps, not just failures.
+            block_resources: Abort font, media and raster image requests
+                (set False to see the full page while debugging).
         """
         self.headless = headless
         self.output_dir = output_dir
+        self.debug = debug
+        self.block_resources = block_resources
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._contexts_used = 0
+
+        self._browser_thread_id: Optional[int] = None
+        self._browser_thread = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="mavat-browser",
+            initializer=self._claim_browser_thread,
+        )
+
+    def _claim_browser_thread(self) -> None:
+        self._browser_thread_id = threading.get_ident()
+
+    def __enter__(self) -> "MavatClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @_on_browser_thread
+    def close(self) -> None:
+        """Shut down the shared browser and the Playwright driver.
+
+        Safe to call from any thread. The client stays usable: the next call
+        launches a new browser.
+        """
+        if self._browser is not None:
+            if self._browser.is_connected():
+                self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _ensure_browser(self) -> Browser:
+        """Return the shared browser, launching (or recycling) it as needed.
+
+        A browser that crashed or disconnected is replaced, so one failure
+        costs a single plan rather than every later call on this client.
+        """
+        if self._browser is not None and not self._browser.is_connected():
+            logger.warning("Browser disconnected, relaunching")
+            self._browser = None
+        elif self._browser is not None and self._contexts_used >= BROWSER_RECYCLE_AFTER:
+            logger.info("Recycling browser after %d contexts", self._contexts_used)
+            self._browser.close()
+            self._browser = None
+
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self._contexts_used = 0
+
+        return self._browser
+
+    @staticmethod
+    def _route_resource(route: Route) -> None:
+        """Abort requests for assets the scraper never looks at.
+
+        SVG images are let through: the download buttons are SVG icons and
+        would collapse to zero size (and never become visible) without them.
+        """
+        request = route.request
+        if (
+            request.resource_type in BLOCKED_RESOURCE_TYPES
+            and not request.url.split("?", 1)[0].lower().endswith(".svg")
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
+    @contextmanager
+    def _new_page(self, accept_downloads: bool = False) -> Iterator[Page]:
+        """Open a page in a fresh context on the shared browser.
+
+        Args:
+            accept_downloads: Allow the page to save downloads.
+
+        Yields:
+            The new page; its context is closed on exit.
+        """
+        context = self._ensure_browser().new_context(
+            viewport={"width": 1280, "height": 900},
+            locale="he-IL",
+            accept_downloads=accept_downloads,
+        )
+        self._contexts_used += 1
+        if self.block_resources:
+            context.route("**/*", self._route_resource)
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+
+    @_on_browser_thread
     def search_plan(self, plan_number: str) -> Optional[dict]:
         """Search for a plan by number on mavat.
 
@@ -77,15 +234,8 @@ class MavatClient:
             Search result dict with MP_ID, ENTITY_NAME, IS_EXIST_INSTRUCTION_FILE,
             etc., or None if not found.
         """
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 900},
-                locale="he-IL",
-            )
-            page = context.new_page()
+        with self._new_page() as page:
             search_result = self._do_search(page, plan_number)
-            browser.close()
 
         if search_result:
             logger.info(
@@ -99,11 +249,36 @@ class MavatClient:
 
         return search_result
 
-    def download_horaot(self, plan_number: str) -> dict:
+    def _cached_download(self, safe_name: str, plan_number: str) -> Optional[dict]:
+        """Return a success result for an already-downloaded הוראות PDF.
+
+        Args:
+            safe_name: Filesystem-safe plan name the PDF was saved under.
+            plan_number: Plan number to report in the result.
+
+        Returns:
+            Result dict (as from download_horaot), or None if not on disk.
+        """
+        cached = self.output_dir / f"{safe_name}.pdf"
+        if not (cached.exists() and cached.stat().st_size > 0):
+            return None
+        logger.info("Using cached הוראות: %s", cached.name)
+        return {
+            "status": "success",
+            "plan_number": plan_number,
+            "file_path": str(cached),
+            "cached": True,
+        }
+
+    @_on_browser_thread
+    def download_horaot(self, plan_number: str, force_refresh: bool = False) -> dict:
         """Full pipeline: search for plan → navigate to it → download הוראות.
 
+        Skips the browser entirely when the PDF is already in output_dir.
+
         Args:
             plan_number: The תב"ע number (e.g., "102-0909267").
+            force_refresh: Re-download even if a cached PDF exists.
 
         Returns:
             Result dict with keys:
@@ -116,22 +291,18 @@ class MavatClient:
         """
         safe_name = plan_number.replace("/", "_").replace("\\", "_")
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 900},
-                locale="he-IL",
-                accept_downloads=True,
-            )
-            page = context.new_page()
+        if not force_refresh:
+            cached = self._cached_download(safe_name, plan_number)
+            if cached:
+                return cached
 
+        with self._new_page(accept_downloads=True) as page:
             # === STEP 1: Search for the plan ===
             logger.info("Step 1: Searching for plan %s", plan_number)
             search_result = self._do_search(page, plan_number)
 
             if not search_result:
                 logger.warning("Plan not found: %s", plan_number)
-                browser.close()
                 return {"status": "not_found", "plan_number": plan_number}
 
             mp_id = int(search_result["MP_ID"])
@@ -152,7 +323,6 @@ class MavatClient:
                 logger.warning(
                     "Plan %s has no instruction file", plan_number
                 )
-                browser.close()
                 return {
                     "status": "no_instructions",
                     "plan_number": plan_number,
@@ -165,8 +335,7 @@ class MavatClient:
             logger.info("Step 2: Navigating to plan page: %s", plan_url)
             page.goto(plan_url, wait_until="domcontentloaded", timeout=45000)
             # Wait for Angular to render the plan page content
-            page.wait_for_selector("text=מסמכי התכנית", timeout=15000)
-            time.sleep(2)
+            page.wait_for_selector(self.DOCS_SEL, timeout=15000)
 
             # === STEP 3: Download הוראות ===
             logger.info("Step 3: Navigating to הוראות download")
@@ -174,8 +343,6 @@ class MavatClient:
                 page, safe_name
             )
 
-            browser.close()
-
         if downloaded_path:
             # Extract PDF from ZIP if needed
             final_path = self._extract_pdf_if_zip(
@@ -197,12 +364,16 @@ class MavatClient:
             "error": "Could not locate or trigger the הוראות download",
         }
 
-    def download_by_mp_id(self, mp_id: str, plan_number: str = "unknown") -> dict:
+    @_on_browser_thread
+    def download_by_mp_id(
+        self, mp_id: str, plan_number: str = "unknown", force_refresh: bool = False
+    ) -> dict:
         """Download הוראות by navigating directly to the plan page via MP_ID.
         
         Args:
             mp_id: The internal Mavat plan ID (e.g. from URL).
             plan_number: Optional plan number for naming the file.
+            force_refresh: Re-download even if a cached PDF exists.
             
         Returns:
             Result dict (same as download_horaot).
@@ -211,21 +382,18 @@ class MavatClient:
         if plan_number == "unknown":
             safe_name = f"mp_{mp_id}"
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 900},
-                locale="he-IL",
-                accept_downloads=True,
-            )
-            page = context.new_page()
+        if not force_refresh:
+            cached = self._cached_download(safe_name, plan_number)
+            if cached:
+                cached["mp_id"] = mp_id
+                return cached
 
+        with self._new_page(accept_downloads=True) as page:
             # Navigate directly
             plan_url = MAVAT_PLAN_URL_TEMPLATE.format(mp_id=mp_id)
             logger.info("Direct navigation to plan page: %s", plan_url)
             page.goto(plan_url, wait_until="domcontentloaded", timeout=45000)
-            page.wait_for_selector("text=מסמכי התכנית", timeout=15000)
-            time.sleep(2)
+            page.wait_for_selector(self.DOCS_SEL, timeout=15000)
 
             # Try to scrape the real plan number from the page if unknown
             entity_name = ""
@@ -243,9 +411,7 @@ class MavatClient:
 
             # Download logic
             downloaded_path = self._click_through_and_download(page, safe_name)
-            
-            browser.close()
-            
+
         if downloaded_path:
             final_path = self._extract_pdf_if_zip(downloaded_path, safe_name)
             return {
@@ -277,13 +443,10 @@ class MavatClient:
             First search result dict, or None if not found.
         """
         page.goto(MAVAT_SEARCH_URL, wait_until="domcontentloaded", timeout=30000)
-        # Wait for Angular to render — look for the search button "חיפוש"
-        # which appears next to the search input
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(3)
 
         # Find the search input: it's a visible text input (not checkbox)
         # with a placeholder attribute. Use role-based or type-based selector.
+        # Waiting for it to be visible also waits for Angular to render.
         search_input = page.locator(
             "input[type='text'][placeholder], "
             "input[type='search'][placeholder]"
@@ -305,7 +468,6 @@ class MavatClient:
                 return None
 
         search_input.fill(plan_number)
-        time.sleep(0.5)
 
         # Submit search and wait for the API response synchronously
         with page.expect_response(
@@ -327,6 +489,47 @@ class MavatClient:
 
         return None
 
+    def _screenshot(self, page: Page, safe_name: str, step: str) -> None:
+        """Save a viewport screenshot to output_dir/debug for troubleshooting.
+
+        Only the newest MAX_DEBUG_SCREENSHOTS files are kept.
+
+        Args:
+            page: Playwright page instance.
+            safe_name: Filesystem-safe plan name.
+            step: Short label for the step that was captured.
+        """
+        debug_dir = self.output_dir / "debug"
+        debug_dir.mkdir(exist_ok=True)
+        try:
+            page.screenshot(
+                path=str(debug_dir / f"{int(time.time())}_{safe_name}_{step}.png")
+            )
+        except Exception as e:
+            logger.info("Could not save %s screenshot: %s", step, e)
+            return
+
+        # Names start with the timestamp, so sorting puts the oldest first
+        for old in sorted(debug_dir.glob("*.png"))[:-MAX_DEBUG_SCREENSHOTS]:
+            old.unlink(missing_ok=True)
+
+    @staticmethod
+    def _wait_visible(locator: Locator, timeout: float) -> bool:
+        """Wait until a locator is visible, returning as soon as it is.
+
+        Args:
+            locator: Element to wait for.
+            timeout: Maximum wait in milliseconds.
+
+        Returns:
+            True if the element became visible, False on timeout.
+        """
+        try:
+            locator.wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
     def _click_through_and_download(
         self, page: Page, safe_name: str
     ) -> Optional[Path]:
@@ -345,71 +548,60 @@ class MavatClient:
         Returns:
             Path to downloaded file, or None if download failed.
         """
+        # Built once; each wait/click below reuses the same handle
+        docs_header = page.locator(self.DOCS_SEL).first
+        approved_header = page.locator(self.APPROVED_SEL).first
+        in_process_header = page.locator(self.IN_PROCESS_SEL).first
+        horaot_header = page.get_by_text(self.HORAOT_TEXT, exact=True).first
+        download_icons = page.locator(
+            f"{self.PDF_DOWNLOAD_SEL}, {self.PDF_DOWNLOAD_SRC_SEL}"
+        ).first
+
         try:
             # Step 1: Click "מסמכי התכנית" to expand
-            docs_header = page.locator("text=מסמכי התכנית").first
-            if docs_header.is_visible(timeout=5000):
+            if self._wait_visible(docs_header, timeout=5000):
                 docs_header.click()
-                time.sleep(2)
+                # Wait for either document group to render
+                self._wait_visible(
+                    approved_header.or_(in_process_header).first, timeout=5000
+                )
                 logger.info("Expanded 'מסמכי התכנית'")
             else:
                 logger.warning("'מסמכי התכנית' not visible")
-                page.screenshot(
-                    path=str(
-                        self.output_dir / f"debug_{safe_name}_step1.png"
-                    )
-                )
+                self._screenshot(page, safe_name, "step1")
                 return None
 
             # Step 2: Click "מסמכים מאושרים (מתן תוקף)" to expand.
             # Fallback to "מסמכים בתהליך" for plans not yet approved.
-            approved_header = page.locator("text=מסמכים מאושרים").first
-            if approved_header.is_visible(timeout=5000):
+            # (Step 1 already waited for one of them, so just check.)
+            if approved_header.is_visible():
                 approved_header.click()
-                time.sleep(2)
                 logger.info("Expanded 'מסמכים מאושרים (מתן תוקף)'")
+            elif in_process_header.is_visible():
+                in_process_header.click()
+                logger.info("Expanded 'מסמכים בתהליך' (fallback)")
             else:
-                in_process_header = page.locator("text=מסמכים בתהליך").first
-                if in_process_header.is_visible(timeout=3000):
-                    in_process_header.click()
-                    time.sleep(2)
-                    logger.info("Expanded 'מסמכים בתהליך' (fallback)")
-                else:
-                    logger.warning(
-                        "'מסמכים מאושרים' and 'מסמכים בתהליך' both not visible"
-                    )
-                    page.screenshot(
-                        path=str(
-                            self.output_dir / f"debug_{safe_name}_step2.png"
-                        )
-                    )
-                    return None
+                logger.warning(
+                    "'מסמכים מאושרים' and 'מסמכים בתהליך' both not visible"
+                )
+                self._screenshot(page, safe_name, "step2")
+                return None
 
             # Step 3: Click "הוראות" sub-dropdown to expand.
-            # Must use exact match — "text=הוראות" also matches
-            # "עיקר הוראותיה" higher on the page.
-            horaot_header = page.get_by_text("הוראות", exact=True).first
-            # Scroll to it first since it may be below the fold
-            horaot_header.scroll_into_view_if_needed()
-            if horaot_header.is_visible(timeout=5000):
+            # Wait for the group expanded in step 2 to render it, then
+            # scroll to it since it may be below the fold
+            if self._wait_visible(horaot_header, timeout=5000):
+                horaot_header.scroll_into_view_if_needed()
                 horaot_header.click()
-                time.sleep(2)
+                self._wait_visible(download_icons, timeout=5000)
                 logger.info("Expanded 'הוראות'")
             else:
                 logger.warning("'הוראות' (exact) not visible")
-                page.screenshot(
-                    path=str(
-                        self.output_dir / f"debug_{safe_name}_step3.png"
-                    )
-                )
+                self._screenshot(page, safe_name, "step3")
                 return None
 
-            # Take debug screenshot showing the expanded הוראות section
-            page.screenshot(
-                path=str(
-                    self.output_dir / f"debug_{safe_name}_horaot_expanded.png"
-                )
-            )
+            if self.debug:
+                self._screenshot(page, safe_name, "horaot_expanded")
 
             # Step 4: Find and click the PDF download icon on the
             # "תדפיס הוראות התכנית" row.
@@ -419,9 +611,7 @@ class MavatClient:
 
         except Exception as e:
             logger.error("Error navigating document sections: %s", e)
-            page.screenshot(
-                path=str(self.output_dir / f"debug_{safe_name}_error.png")
-            )
+            self._screenshot(page, safe_name, "error")
             return None
 
     def _click_pdf_download(
@@ -436,6 +626,9 @@ class MavatClient:
 
         We click the download icon (class "pdf-download").
 
+        The caller has already waited for either icon to appear, so both
+        checks here are immediate.
+
         Args:
             page: Playwright page with הוראות section expanded.
             safe_name: Filesystem-safe name for saving the file.
@@ -445,8 +638,8 @@ class MavatClient:
         """
         # Primary: click the img with class "pdf-download"
         try:
-            download_icon = page.locator("img.pdf-download").first
-            if download_icon.is_visible(timeout=5000):
+            download_icon = page.locator(self.PDF_DOWNLOAD_SEL).first
+            if download_icon.is_visible():
                 download_icon.scroll_into_view_if_needed()
                 logger.info("Found PDF download icon (img.pdf-download)")
                 return self._trigger_download(
@@ -457,10 +650,8 @@ class MavatClient:
 
         # Fallback: any img with src containing "pdf-download"
         try:
-            download_icon = page.locator(
-                "img[src*='pdf-download']"
-            ).first
-            if download_icon.is_visible(timeout=3000):
+            download_icon = page.locator(self.PDF_DOWNLOAD_SRC_SEL).first
+            if download_icon.is_visible():
                 logger.info("Found PDF download icon by src attribute")
                 return self._trigger_download(
                     page, download_icon, safe_name
@@ -469,13 +660,11 @@ class MavatClient:
             logger.info("img[src*='pdf-download'] not found: %s", e)
 
         logger.warning("No PDF download icon found in הוראות section")
-        page.screenshot(
-            path=str(self.output_dir / f"debug_{safe_name}_no_pdf.png")
-        )
+        self._screenshot(page, safe_name, "no_pdf")
         return None
 
     def _trigger_download(
-        self, page: Page, element: "Locator", safe_name: str
+        self, page: Page, element: Locator, safe_name: str
     ) -> Optional[Path]:
         """Click an element and capture the resulting download.
 
@@ -518,19 +707,21 @@ class MavatClient:
         try:
             with zipfile.ZipFile(file_path, "r") as zf:
                 pdf_files = [
-                    n for n in zf.namelist() if n.lower().endswith(".pdf")
+                    info
+                    for info in zf.infolist()
+                    if info.filename.lower().endswith(".pdf")
                 ]
                 if pdf_files:
-                    # Extract the first PDF
-                    pdf_name = pdf_files[0]
+                    # Extract the first PDF, streaming in 1 MB chunks
+                    pdf_info = pdf_files[0]
                     extracted_path = self.output_dir / f"{safe_name}.pdf"
-                    with zf.open(pdf_name) as src, open(
+                    with zf.open(pdf_info) as src, open(
                         extracted_path, "wb"
                     ) as dst:
-                        dst.write(src.read())
+                        shutil.copyfileobj(src, dst, length=1 << 20)
                     logger.info(
                         "Extracted PDF from ZIP: %s → %s",
-                        pdf_name,
+                        pdf_info.filename,
                         extracted_path,
                     )
                     return extracted_path
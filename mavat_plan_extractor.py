@@ -4,17 +4,26 @@ Full pipeline: search for plan → download הוראות PDF → extract buildin
 table (Section 5) and keyword data.
 
 Usage:
-    from mavat_plan_extractor import MavatPlanExtractor
+    from mavat_plan_extractor import get_extractor
 
-    ext = MavatPlanExtractor()
+    ext = get_extractor()  # or MavatPlanExtractor(output_dir=...)
     result = ext.process_plan("102-0909267")
     print(result)
+
+process_plan is thread-safe: each thread gets its own MavatClient (and
+browser), so a ThreadPoolExecutor's max_workers bounds the live browsers.
+Call close() once done to shut every one of them down.
 """
 
+import functools
+import json
 import logging
+import os
 import re
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import pdfplumber
 
@@ -30,25 +39,120 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Reuse a processed plan's cached result for this long
+PLAN_CACHE_TTL_DAYS = 30
+
+# Keywords flagged for quick filtering, matched in one pass
+KEYWORDS = ["זכויות בניה", "שטח עיקרי", "שטח שירות", "קומות"]
+_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, KEYWORDS)))
+
 
 class MavatPlanExtractor:
     """Coordinator for searching, downloading, and extracting data from Mavat plans."""
 
-    def __init__(self, output_dir: str = "data/mavat_cache") -> None:
+    def __init__(
+        self,
+        output_dir: str = "data/mavat_cache",
+        cache_ttl_days: float = PLAN_CACHE_TTL_DAYS,
+    ) -> None:
         """Initialize the extractor.
 
         Args:
             output_dir: Directory for cached downloads and extracted data.
+            cache_ttl_days: Age (of the cached PDF) after which a plan is
+                downloaded and extracted again.
         """
         self.output_dir = Path(output_dir)
+        self.cache_ttl_seconds = cache_ttl_days * 86400
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.client = MavatClient(output_dir=self.output_dir)
+        # One MavatClient (browser) per calling thread, so threads never
+        # queue behind each other; every client is registered for close()
+        self._local = threading.local()
+        self._clients: list[MavatClient] = []
+        self._clients_lock = threading.Lock()
+
+    @property
+    def client(self) -> MavatClient:
+        """The calling thread's MavatClient, created on first use."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = MavatClient(output_dir=self.output_dir)
+            self._local.client = client
+            with self._clients_lock:
+                self._clients.append(client)
+        return client
+
+    def close(self) -> None:
+        """Shut down the browsers of every thread that used this extractor.
+
+        Safe to call from any thread (each MavatClient runs its browser on its
+        own thread). Clients stay usable and relaunch a browser on next use.
+        """
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.close()
+            except Exception as exc:
+                logger.warning("Failed to close Mavat browser: %s", exc)
+
+    def _pdf_expired(self, safe_name: str) -> bool:
+        """Return True if a cached PDF exists but is older than the TTL.
+
+        Args:
+            safe_name: Filesystem-safe plan name (cache file stem).
+        """
+        try:
+            mtime = (self.output_dir / f"{safe_name}.pdf").stat().st_mtime
+        except OSError:
+            return False
+        return time.time() - mtime > self.cache_ttl_seconds
+
+    def _load_cached_result(self, safe_name: str) -> Optional[dict[str, Any]]:
+        """Return a previously stored result if its PDF is within the TTL.
 
-    def process_plan(self, plan_input: str) -> dict[str, Any]:
+        Args:
+            safe_name: Filesystem-safe plan name (cache file stem).
+
+        Returns:
+            The cached result dict, or None on a miss or stale entry.
+        """
+        cache_pdf = self.output_dir / f"{safe_name}.pdf"
+        cache_json = self.output_dir / f"{safe_name}.json"
+        try:
+            if time.time() - cache_pdf.stat().st_mtime > self.cache_ttl_seconds:
+                return None
+            with open(cache_json, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cached_result(self, safe_name: str, result: dict[str, Any]) -> None:
+        """Write a result next to its PDF (tmp file + rename, so never torn).
+
+        Args:
+            safe_name: Filesystem-safe plan name (cache file stem).
+            result: Successful process_plan result.
+        """
+        cache_json = self.output_dir / f"{safe_name}.json"
+        tmp = cache_json.with_name(f"{cache_json.name}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(
+                json.dumps(result, ensure_ascii=False, default=str), encoding="utf-8"
+            )
+            os.replace(tmp, cache_json)
+        except OSError as exc:
+            logger.warning("Could not cache result for %s: %s", safe_name, exc)
+
+    def process_plan(self, plan_input: str, force_refresh: bool = False) -> dict[str, Any]:
         """Full flow: Download PDF → Extract Data → Return Result.
 
+        Successful results are cached in output_dir and returned directly on
+        later calls until the PDF is older than the cache TTL.
+
         Args:
             plan_input: Plan number (e.g. "102-0909267") OR Mavat URL.
+            force_refresh: Ignore cached results and the cached PDF.
 
         Returns:
             Dict with keys: plan_number, status, pdf_path, extracted_data, error.
@@ -64,14 +168,32 @@ class MavatPlanExtractor:
         # Check if input is a URL with MP_ID
         mp_id_match = re.search(r"/SV4/1/(\d+)", plan_input)
 
+        if mp_id_match:
+            safe_name = f"mp_{mp_id_match.group(1)}"
+        else:
+            safe_name = plan_input.replace("/", "_").replace("\\", "_")
+
+        # An expired PDF is downloaded again rather than reused by the client
+        refresh = force_refresh or self._pdf_expired(safe_name)
+
+        if not refresh:
+            cached = self._load_cached_result(safe_name)
+            if cached:
+                logger.info("Using cached result for %s", plan_input)
+                return cached
+
         logger.info("Starting Mavat process for %s", plan_input)
 
         if mp_id_match:
             mp_id = mp_id_match.group(1)
             logger.info("Detected MP_ID %s from URL", mp_id)
-            download_res = self.client.download_by_mp_id(mp_id)
+            download_res = self.client.download_by_mp_id(
+                mp_id, force_refresh=refresh
+            )
         else:
-            download_res = self.client.download_horaot(plan_input)
+            download_res = self.client.download_horaot(
+                plan_input, force_refresh=refresh
+            )
 
         if download_res["status"] != "success":
             result["status"] = "download_failed"
@@ -86,6 +208,7 @@ class MavatPlanExtractor:
             extracted = self._parse_pdf(pdf_path, plan_input)
             result["extracted_data"] = extracted
             result["status"] = "success"
+            self._save_cached_result(safe_name, result)
         except Exception as e:
             logger.error("Extraction failed: %s", e)
             result["status"] = "extraction_failed"
@@ -113,43 +236,61 @@ class MavatPlanExtractor:
             "building_rights": None,
         }
 
-        # Extract building rights table (Section 5)
-        rights_result = extract_building_rights(pdf_path, plan_number=plan_number)
-        if rights_result["success"]:
-            # Strip internal _raw data before storing
-            clean_rows = []
-            for row in rights_result.get("rows", []):
-                clean_rows.append({k: v for k, v in row.items() if k != "_raw"})
-            rights_result["rows"] = clean_rows
-            data["building_rights"] = rights_result
-            logger.info(
-                "Extracted %d building rights rows from %s",
-                len(clean_rows), pdf_path.name,
-            )
-        else:
-            logger.warning(
-                "Building rights extraction failed: %s",
-                rights_result.get("errors"),
-            )
-            data["building_rights"] = rights_result
-
-        # Keyword search for quick filtering
+        # Open once: both passes below share the parsed PDF and page text
         with pdfplumber.open(pdf_path) as pdf:
-            full_text = ""
-            for page in pdf.pages[:10]:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
+            page_texts: dict[int, str] = {}
 
-            data["text_preview"] = full_text[:500] + "..."
+            # Extract building rights table (Section 5)
+            rights_result = extract_building_rights(
+                pdf_path, plan_number=plan_number, pdf=pdf, page_texts=page_texts,
+            )
+            if rights_result["success"]:
+                # Strip internal _raw data before storing
+                clean_rows = []
+                for row in rights_result.get("rows", []):
+                    clean_rows.append({k: v for k, v in row.items() if k != "_raw"})
+                rights_result["rows"] = clean_rows
+                data["building_rights"] = rights_result
+                logger.info(
+                    "Extracted %d building rights rows from %s",
+                    len(clean_rows), pdf_path.name,
+                )
+            else:
+                logger.warning(
+                    "Building rights extraction failed: %s",
+                    rights_result.get("errors"),
+                )
+                data["building_rights"] = rights_result
+
+            # Keyword search for quick filtering (Section 5 scanning has
+            # usually extracted these pages' text already)
+            texts = []
+            found: set[str] = set()
+            for page_idx, page in enumerate(pdf.pages[:10]):
+                text = page_texts.get(page_idx)
+                if text is None:
+                    text = page.extract_text() or ""
+                if text:
+                    texts.append(text)
+                    found.update(_KEYWORD_PATTERN.findall(text))
+                    # Later pages only matter for keywords not yet seen
+                    if len(found) == len(KEYWORDS):
+                        break
 
-            keywords = ["זכויות בניה", "שטח עיקרי", "שטח שירות", "קומות"]
-            for kw in keywords:
-                if kw in full_text:
-                    data["keywords_found"].append(kw)
+            data["text_preview"] = "\n".join(texts)[:500] + "..."
+            data["keywords_found"] = [kw for kw in KEYWORDS if kw in found]
 
         return data
 
 
-# Singleton instance provided for ease of use
-extractor = MavatPlanExtractor()
+@functools.lru_cache(maxsize=1)
+def get_extractor() -> MavatPlanExtractor:
+    """Return the shared extractor, created on first use (not at import)."""
+    return MavatPlanExtractor()
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from mavat_plan_extractor import extractor` working, lazily
+    if name == "extractor":
+        return get_extractor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
@@ -29,18 +30,18 @@ from config import (
     TENDER_DETAIL_API,
 )
 from dashboard_utils import (
+    get_client,
     get_user_email,
     load_building_rights_data,
     load_data,
     load_tender_details,
     render_email_input,
 )
-from data_client import LandTendersClient, build_document_url
+from data_client import build_document_url
 from user_db import REVIEW_STAGES, UserDB
 
 # ── Constants ────────────────────────────────────────────────────────────────
 MEGIDO_CHART_COLORS = ["#D4A017", "#3B82F6", "#1B2A4A", "#10B981", "#EF4444", "#8B5CF6"]
-MEGIDO_GOLD_SCALE = [[0, "#FEF3C7"], [1, "#D4A017"]]
 PLOTLY_FONT = dict(family="Inter, Heebo, sans-serif", size=11, color="#111827")
 PLOTLY_BG = dict(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
 
@@ -50,10 +51,11 @@ today = datetime.now()
 render_email_input()
 
 df_all = load_data(data_source="latest_file")
-# Pre-filter: only 5 relevant types
-df = df_all[df_all["tender_type_code"].isin(RELEVANT_TENDER_TYPES)].copy()
-# Active-only base
-active_df = df[~df["status"].isin(NON_ACTIVE_STATUSES)].copy()
+# Pre-filter: only 5 relevant types, and an active-only base. Both are single
+# read-only gathers from df_all through combined masks, without copies.
+_type_mask = df_all["tender_type_code"].isin(RELEVANT_TENDER_TYPES).to_numpy()
+df = df_all[_type_mask]
+active_df = df_all[_type_mask & ~df_all["status"].isin(NON_ACTIVE_STATUSES).to_numpy()]
 
 
 # ============================================================================
@@ -152,12 +154,15 @@ def _last_sunday(ref_date: datetime) -> datetime:
 
 sunday_cutoff = _last_sunday(today)
 
+# Deadline masks, computed once per rerun (NaT compares False, so missing
+# deadlines drop out without a separate notna() pass)
+_deadline = active_df["deadline"]
+open_mask = (_deadline >= today).to_numpy()
+closing_soon_mask = open_mask & (_deadline <= today + timedelta(days=CLOSING_SOON_DAYS)).to_numpy()
+booklet_mask = (active_df["published_booklet"] == True).to_numpy()
+
 # New tenders: have brochure + still open + published this week
-new_tenders_df = active_df[
-    (active_df["published_booklet"] == True)
-    & (active_df["deadline"].notna())
-    & (active_df["deadline"] >= today)
-].copy()
+new_tenders_df = active_df[booklet_mask & open_mask]
 
 date_col = None
 for candidate in ["created_date", "publish_date", "published_date"]:
@@ -177,8 +182,9 @@ with col_new:
         unsafe_allow_html=True,
     )
     if len(new_tenders_df) > 0:
-        new_display = new_tenders_df[["tender_name", "city", "units", "tender_type", "deadline"]].copy()
-        new_display.columns = ["שם מכרז", "עיר", 'יח"ד', "סוג", "מועד אחרון"]
+        new_display = new_tenders_df[["tender_name", "city", "units", "tender_type", "deadline"]].set_axis(
+            ["שם מכרז", "עיר", 'יח"ד', "סוג", "מועד אחרון"], axis=1,
+        )
         new_display["מועד אחרון"] = pd.to_datetime(new_display["מועד אחרון"]).dt.strftime("%d/%m/%Y")
         new_display = new_display.sort_values('יח"ד', ascending=False)
         st.dataframe(
@@ -191,13 +197,7 @@ with col_new:
         st.info("אין מכרזים חדשים עם חוברת השבוע")
 
 with col_kpi:
-    closing_soon_count = len(
-        active_df[
-            (active_df["deadline"].notna())
-            & (active_df["deadline"] >= today)
-            & (active_df["deadline"] <= today + timedelta(days=CLOSING_SOON_DAYS))
-        ]
-    )
+    closing_soon_count = int(closing_soon_mask.sum())
     k1, k2 = st.columns(2)
     with k1:
         st.metric("🟢 פעילים", f"{len(active_df):,}")
@@ -247,12 +247,11 @@ with col_pies:
         pie2_opts = {"1W": 7, "2W": 14, "4W": 28}
         urg = st.session_state.get("urgency_pie2", "4W")
         pie2_days = pie2_opts.get(urg, 28)
-        pie2_df = active_df[active_df["published_booklet"] == True].copy()
         pie2_cut = today + timedelta(days=pie2_days)
-        pie2_df = pie2_df[(pie2_df["deadline"].notna()) & (pie2_df["deadline"] >= today) & (pie2_df["deadline"] <= pie2_cut)]
+        pie2_df = active_df[booklet_mask & open_mask & (_deadline <= pie2_cut).to_numpy()]
 
         if "region" in pie2_df.columns and len(pie2_df) > 0:
-            br = pie2_df.groupby("region").size().reset_index(name="count").sort_values("count", ascending=False)
+            br = pie2_df.groupby("region", observed=True).size().reset_index(name="count").sort_values("count", ascending=False)
             if not br.empty:
                 fig2 = px.pie(br, values="count", names="region", hole=0.55, color_discrete_sequence=MEGIDO_CHART_COLORS)
                 fig2.update_traces(textinfo="value", textposition="inside", textfont_size=12)
@@ -275,7 +274,7 @@ with col_pies:
     with p3:
         st.markdown('<p class="pie-title" style="font-size:13px;">פעילים לפי מחוז</p>', unsafe_allow_html=True)
         if "region" in active_df.columns and len(active_df) > 0:
-            tr = active_df.groupby("region").size().reset_index(name="count").sort_values("count", ascending=False)
+            tr = active_df.groupby("region", observed=True).size().reset_index(name="count").sort_values("count", ascending=False)
             if not tr.empty:
                 fig3 = px.pie(tr, values="count", names="region", hole=0.55, color_discrete_sequence=MEGIDO_CHART_COLORS)
                 fig3.update_traces(textinfo="value", textposition="inside", textfont_size=12)
@@ -298,26 +297,16 @@ with col_deadlines:
     # Toggle: 2 weeks / all
     show_all_deadlines = st.toggle("הצג הכל", value=False, key="deadline_toggle")
 
-    upcoming = active_df[
-        (active_df["deadline"].notna())
-        & (active_df["deadline"] >= today)
+    up_disp = active_df.loc[
+        open_mask if show_all_deadlines else closing_soon_mask,
+        ["tender_name", "city", "units", "deadline"],
     ].sort_values("deadline")
 
-    if not show_all_deadlines:
-        upcoming = upcoming[upcoming["deadline"] <= today + timedelta(days=CLOSING_SOON_DAYS)]
-
-    if len(upcoming) > 0:
-        up_disp = upcoming[["tender_name", "city", "units", "deadline"]].copy()
+    if len(up_disp) > 0:
         up_disp["days_left"] = (up_disp["deadline"] - today).dt.days
 
-        def _urgency(d: int) -> str:
-            if d <= 7:
-                return "🔴"
-            if d <= 14:
-                return "🟡"
-            return "🟢"
-
-        up_disp.insert(0, "urg", up_disp["days_left"].apply(_urgency))
+        _days = up_disp["days_left"].to_numpy()
+        up_disp.insert(0, "urg", np.select([_days <= 7, _days <= 14], ["🔴", "🟡"], default="🟢"))
         up_disp["deadline"] = up_disp["deadline"].dt.strftime("%d/%m")
 
         st.dataframe(
@@ -345,367 +334,339 @@ st.markdown("---")
 # ROW 3: DATA EXPLORER — 4 inline filters, pre-filtered
 # ============================================================================
 
+@st.cache_data(max_entries=16)
+def _explorer_csv(frame: pd.DataFrame) -> bytes:
+    """Encode the explorer selection as CSV with a UTF-8 BOM (for Excel).
+
+    Cached on the frame's contents, so reruns that leave the selection
+    unchanged reuse the bytes instead of re-encoding every row.
+    """
+    return frame.to_csv(index=False).encode("utf-8-sig")
+
+
 st.markdown(
     '<div class="section-header" style="font-size:1rem;margin:0 0 6px 0;">📋 סייר מכרזים</div>',
     unsafe_allow_html=True,
 )
 
-# Start from active_df (already filtered to 5 types + active)
-explorer_df = active_df.copy()
-
-f1, f2, f3, f4 = st.columns(4)
-with f1:
-    _cities = sorted(explorer_df["city"].dropna().unique().tolist())
-    sel_cities = st.multiselect("עיר", _cities, default=[], key="exp_city", placeholder="הכל")
-    if sel_cities:
-        explorer_df = explorer_df[explorer_df["city"].isin(sel_cities)]
-
-with f2:
-    _regions = sorted(explorer_df["region"].dropna().unique().tolist()) if "region" in explorer_df.columns else []
-    sel_regions = st.multiselect("מחוז", _regions, default=[], key="exp_region", placeholder="הכל")
-    if sel_regions:
-        explorer_df = explorer_df[explorer_df["region"].isin(sel_regions)]
-
-with f3:
-    _purposes = sorted(explorer_df["purpose"].dropna().unique().tolist()) if "purpose" in explorer_df.columns else []
-    sel_purpose = st.multiselect("ייעוד", _purposes, default=[], key="exp_purpose", placeholder="הכל")
-    if sel_purpose:
-        explorer_df = explorer_df[explorer_df["purpose"].isin(sel_purpose)]
-
-with f4:
-    _statuses = sorted(explorer_df["status"].dropna().unique().tolist())
-    sel_status = st.multiselect("סטטוס", _statuses, default=[], key="exp_status", placeholder="הכל")
-    if sel_status:
-        explorer_df = explorer_df[explorer_df["status"].isin(sel_status)]
-
-# Fixed display columns
-EXP_COLS = ["tender_name", "city", "region", "tender_type", "purpose", "units", "deadline", "status", "published_booklet"]
-display_cols = [c for c in EXP_COLS if c in explorer_df.columns]
-
-if display_cols:
-    exp_display = explorer_df[display_cols].copy()
-    if "deadline" in exp_display.columns:
-        exp_display = exp_display.sort_values("deadline", ascending=True, na_position="last")
-
-    for col in ["publish_date", "deadline", "committee_date"]:
-        if col in exp_display.columns:
-            exp_display[col] = pd.to_datetime(exp_display[col], errors="coerce")
-
-    st.caption(f"{len(exp_display):,} רשומות")
-    st.dataframe(
-        exp_display,
-        hide_index=True,
-        use_container_width=True,
-        column_config={
-            "tender_name": st.column_config.TextColumn("שם מכרז", width="large"),
-            "city": st.column_config.TextColumn("עיר", width="medium"),
-            "region": st.column_config.TextColumn("מחוז", width="small"),
-            "tender_type": st.column_config.TextColumn("סוג", width="medium"),
-            "purpose": st.column_config.TextColumn("ייעוד", width="medium"),
-            "units": st.column_config.NumberColumn('יח"ד', format="%d"),
-            "deadline": st.column_config.DateColumn("מועד סגירה", format="YYYY-MM-DD"),
-            "status": st.column_config.TextColumn("סטטוס", width="small"),
-            "published_booklet": st.column_config.CheckboxColumn("חוברת"),
-        },
-    )
-
-    csv = explorer_df[display_cols].to_csv(index=False, encoding="utf-8-sig")
-    st.download_button(
-        label="📥 הורד CSV",
-        data=csv,
-        file_name=f"land_tenders_{today.strftime('%Y%m%d')}.csv",
-        mime="text/csv",
-    )
-
-
-# ============================================================================
-# ROW 4: TENDER DETAIL VIEWER (expander)
-# ============================================================================
 
-with st.expander("🔍 צפייה בפרטי מכרז", expanded=False):
-    col_select, col_refresh = st.columns([4, 1])
+@st.fragment
+def _render_explorer() -> None:
+    """Render the explorer filters, table and CSV download.
+
+    Runs as a fragment: changing a filter reruns only the explorer, not the
+    KPIs, pies and analytics charts above and below it.
+    """
+    # Start from active_df (already filtered to 5 types + active). Filters AND
+    # into one row mask and the frame is sliced once; each option list still
+    # cascades from the filters to its left.
+    explorer_mask = np.ones(len(active_df), dtype=bool)
+
+    f1, f2, f3, f4 = st.columns(4)
+    with f1:
+        _cities = sorted(active_df.loc[explorer_mask, "city"].dropna().unique().tolist())
+        sel_cities = st.multiselect("עיר", _cities, default=[], key="exp_city", placeholder="הכל")
+        if sel_cities:
+            explorer_mask &= active_df["city"].isin(sel_cities).to_numpy()
+
+    with f2:
+        _regions = sorted(active_df.loc[explorer_mask, "region"].dropna().unique().tolist()) if "region" in active_df.columns else []
+        sel_regions = st.multiselect("מחוז", _regions, default=[], key="exp_region", placeholder="הכל")
+        if sel_regions:
+            explorer_mask &= active_df["region"].isin(sel_regions).to_numpy()
+
+    with f3:
+        _purposes = sorted(active_df.loc[explorer_mask, "purpose"].dropna().unique().tolist()) if "purpose" in active_df.columns else []
+        sel_purpose = st.multiselect("ייעוד", _purposes, default=[], key="exp_purpose", placeholder="הכל")
+        if sel_purpose:
+            explorer_mask &= active_df["purpose"].isin(sel_purpose).to_numpy()
+
+    with f4:
+        _statuses = sorted(active_df.loc[explorer_mask, "status"].dropna().unique().tolist())
+        sel_status = st.multiselect("סטטוס", _statuses, default=[], key="exp_status", placeholder="הכל")
+        if sel_status:
+            explorer_mask &= active_df["status"].isin(sel_status).to_numpy()
+
+    explorer_df = active_df.loc[explorer_mask]
+
+    # Fixed display columns
+    EXP_COLS = ["tender_name", "city", "region", "tender_type", "purpose", "units", "deadline", "status", "published_booklet"]
+    display_cols = [c for c in EXP_COLS if c in explorer_df.columns]
+
+    if display_cols:
+        exp_display = explorer_df[display_cols]
+        if "deadline" in exp_display.columns:
+            exp_display = exp_display.sort_values("deadline", ascending=True, na_position="last")
+
+        for col in ["publish_date", "deadline", "committee_date"]:
+            if col in exp_display.columns:
+                exp_display[col] = pd.to_datetime(exp_display[col], errors="coerce")
+
+        st.caption(f"{len(exp_display):,} רשומות")
+        st.dataframe(
+            exp_display,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "tender_name": st.column_config.TextColumn("שם מכרז", width="large"),
+                "city": st.column_config.TextColumn("עיר", width="medium"),
+                "region": st.column_config.TextColumn("מחוז", width="small"),
+                "tender_type": st.column_config.TextColumn("סוג", width="medium"),
+                "purpose": st.column_config.TextColumn("ייעוד", width="medium"),
+                "units": st.column_config.NumberColumn('יח"ד', format="%d"),
+                "deadline": st.column_config.DateColumn("מועד סגירה", format="YYYY-MM-DD"),
+                "status": st.column_config.TextColumn("סטטוס", width="small"),
+                "published_booklet": st.column_config.CheckboxColumn("חוברת"),
+            },
+        )
 
-    with col_select:
-        detail_candidates = active_df.copy()
-        if len(detail_candidates) == 0:
-            detail_candidates = df.head(50)
-        detail_candidates = detail_candidates.sort_values("deadline", ascending=False)
+        st.download_button(
+            label="📥 הורד CSV",
+            data=_explorer_csv(explorer_df[display_cols]),
+            file_name=f"land_tenders_{today.strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+        )
 
-        def _fmt_label(row: pd.Series) -> str:
-            name = row["tender_name"][:50] if pd.notna(row["tender_name"]) else "N/A"
-            city = row["city"][:20] if pd.notna(row["city"]) else "N/A"
-            return f"{row['tender_id']} - {name} ({city})"
 
-        detail_candidates["_label"] = detail_candidates.apply(_fmt_label, axis=1)
+_render_explorer()
 
-        selected_tender_id = st.selectbox(
-            "בחר מכרז",
-            options=detail_candidates["tender_id"].tolist(),
-            format_func=lambda tid: detail_candidates[detail_candidates["tender_id"] == tid]["_label"].values[0],
-            key="detail_select",
-        )
 
-    with col_refresh:
-        force_refresh = st.checkbox("רענן", value=False, help="עקוף מטמון")
-
-    if selected_tender_id:
-        with st.spinner(f"טוען פרטי מכרז {selected_tender_id}..."):
-            details = load_tender_details(selected_tender_id)
-            list_data = active_df[active_df["tender_id"] == selected_tender_id]
-            list_data = list_data.iloc[0].to_dict() if len(list_data) > 0 else None
-
-        if details:
-            st.markdown("### סקירה כללית")
-            ov1, ov2, ov3, ov4 = st.columns(4)
-            with ov1:
-                st.metric("מס' מכרז", details.get("MichrazID", selected_tender_id))
-            with ov2:
-                st.metric("סטטוס", list_data.get("status", "N/A") if list_data else "N/A")
-            with ov3:
-                units = details.get("YechidotDiur", list_data.get("units", 0) if list_data else 0)
-                st.metric('יח"ד', f"{int(units):,}" if units else "N/A")
-            with ov4:
-                deadline_dt = pd.to_datetime(details.get("SgiraDate"), errors="coerce")
-                if pd.notna(deadline_dt):
-                    deadline_naive = deadline_dt.tz_localize(None) if deadline_dt.tzinfo else deadline_dt
-                    st.metric("ימים לסגירה", (deadline_naive - today).days)
-                else:
-                    st.metric("מועד סגירה", "N/A")
-
-            st.markdown("---")
-            st.markdown("### פרטי מכרז")
-            info_left, info_right = st.columns(2)
-
-            with info_left:
-                tender_name = details.get("MichrazName", "N/A")
-                city_val = list_data.get("city", "N/A") if list_data else "N/A"
-                location = details.get("Shchuna", list_data.get("location", "") if list_data else "")
-                tender_type_val = list_data.get("tender_type", "N/A") if list_data else "N/A"
-                purpose_val = list_data.get("purpose", "N/A") if list_data else "N/A"
-                st.markdown(
-                    f'<div class="detail-field">'
-                    f"<strong>שם מכרז:</strong> {tender_name}<br>"
-                    f"<strong>עיר:</strong> {city_val}<br>"
-                    + (f"<strong>מיקום:</strong> {location}<br>" if location else "")
-                    + f"<strong>סוג:</strong> {tender_type_val}<br>"
-                    f"<strong>ייעוד:</strong> {purpose_val}"
-                    f"</div>",
-                    unsafe_allow_html=True,
-                )
+# ============================================================================
+# ROW 4: TENDER DETAIL VIEWER (expander)
+# ============================================================================
 
-            with info_right:
-                publish = pd.to_datetime(details.get("PtichaDate"), errors="coerce")
-                publish_str = publish.strftime("%Y-%m-%d") if pd.notna(publish) else "N/A"
-                deadline_dt2 = pd.to_datetime(details.get("SgiraDate"), errors="coerce")
-                deadline_str = deadline_dt2.strftime("%Y-%m-%d %H:%M") if pd.notna(deadline_dt2) else "N/A"
-                committee = pd.to_datetime(details.get("VaadaDate"), errors="coerce")
-                committee_str = committee.strftime("%Y-%m-%d") if pd.notna(committee) else "N/A"
-                st.markdown(
-                    f'<div class="detail-field">'
-                    f"<strong>תאריך פרסום:</strong> {publish_str}<br>"
-                    f"<strong>מועד סגירה:</strong> {deadline_str}<br>"
-                    f"<strong>תאריך ועדה:</strong> {committee_str}"
-                    f"</div>",
-                    unsafe_allow_html=True,
-                )
+@st.fragment
+def _render_tender_detail_viewer() -> None:
+    """Render the tender detail viewer.
+
+    Runs as a fragment, so picking a tender or toggling refresh reruns only
+    this block instead of rebuilding every table and chart on the page.
+    """
+    with st.expander("🔍 צפייה בפרטי מכרז", expanded=False):
+        col_select, col_refresh = st.columns([4, 1])
+
+        with col_select:
+            detail_candidates = active_df if len(active_df) > 0 else df.head(50)
+            detail_candidates = detail_candidates.sort_values("deadline", ascending=False)
+
+            _names = detail_candidates["tender_name"].str.slice(0, 50).fillna("N/A")
+            _cities = detail_candidates["city"].str.slice(0, 20).fillna("N/A")
+            _detail_labels = dict(zip(
+                detail_candidates["tender_id"],
+                detail_candidates["tender_id"].astype(str) + " - " + _names + " (" + _cities + ")",
+            ))
+
+            selected_tender_id = st.selectbox(
+                "בחר מכרז",
+                options=detail_candidates["tender_id"].tolist(),
+                format_func=_detail_labels.get,
+                key="detail_select",
+            )
 
-            # ── Bids ─────────────────────────────────────────────────────
-            st.markdown("---")
-            st.markdown("### 💰 הצעות ומציעים")
-            plots = details.get("Tik", [])
-            if plots:
-                for plot_idx, plot in enumerate(plots, 1):
-                    st.markdown(f"#### מגרש {plot_idx}: {plot.get('TikID', 'N/A')}")
-                    winner_name = (plot.get("ShemZoche") or "").strip()
-                    winner_amount = plot.get("SchumZchiya", 0)
-                    if winner_name:
-                        st.success(f"🏆 **זוכה:** {winner_name}")
-                        st.markdown(
-                            f'<div class="detail-field">'
-                            f"<strong>סכום זכייה:</strong> ₪{winner_amount:,.2f} | "
-                            f"<strong>שטח:</strong> {plot.get('Shetach', 0):,} מ\"ר | "
-                            f"<strong>מחיר סף:</strong> ₪{plot.get('MechirSaf', 0):,.2f}"
-                            f"</div>",
-                            unsafe_allow_html=True,
-                        )
-                    bidders = plot.get("mpHatzaaotMitcham", [])
-                    if bidders:
-                        st.info(f"📊 **סה\"כ הצעות:** {len(bidders)}")
-                        bidder_df = pd.DataFrame(bidders).sort_values("HatzaaSum", ascending=False)
-                        disp_bid = bidder_df.copy()
-                        disp_bid["HatzaaSum"] = disp_bid["HatzaaSum"].apply(
-                            lambda x: f"₪{x:,.2f}" if pd.notna(x) else "N/A"
-                        )
-                        disp_bid = disp_bid.rename(columns={
-                            "HatzaaID": "מס' הצעה", "HatzaaSum": "סכום", "HatzaaDescription": "תיאור"
-                        })
-                        st.dataframe(disp_bid, use_container_width=True, hide_index=True)
+        with col_refresh:
+            force_refresh = st.checkbox("רענן", value=False, help="עקוף מטמון")
+
+        if selected_tender_id:
+            with st.spinner(f"טוען פרטי מכרז {selected_tender_id}..."):
+                details = load_tender_details(selected_tender_id)
+                list_data = active_df[active_df["tender_id"] == selected_tender_id]
+                list_data = list_data.iloc[0].to_dict() if len(list_data) > 0 else None
+
+            if details:
+                st.markdown("### סקירה כללית")
+                ov1, ov2, ov3, ov4 = st.columns(4)
+                with ov1:
+                    st.metric("מס' מכרז", details.get("MichrazID", selected_tender_id))
+                with ov2:
+                    st.metric("סטטוס", list_data.get("status", "N/A") if list_data else "N/A")
+                with ov3:
+                    units = details.get("YechidotDiur", list_data.get("units", 0) if list_data else 0)
+                    st.metric('יח"ד', f"{int(units):,}" if units else "N/A")
+                with ov4:
+                    deadline_dt = pd.to_datetime(details.get("SgiraDate"), errors="coerce")
+                    if pd.notna(deadline_dt):
+                        deadline_naive = deadline_dt.tz_localize(None) if deadline_dt.tzinfo else deadline_dt
+                        st.metric("ימים לסגירה", (deadline_naive - today).days)
                     else:
-                        st.info("אין הצעות למגרש זה")
-                    if plot_idx < len(plots):
-                        st.markdown("---")
-            else:
-                st.info("אין מידע על הצעות למכרז זה")
-
-            # ── Documents ────────────────────────────────────────────────
-            st.markdown("---")
-            st.markdown("### 📄 מסמכים")
-            full_doc = details.get("MichrazFullDocument")
-            if full_doc and full_doc.get("RowID") is not None:
-                doc_name = full_doc.get("DocName", "מסמך פרסום מלא.pdf")
-                doc_url = build_document_url(full_doc)
-                st.markdown(f"📕 [**הורד: {doc_name}**]({doc_url})")
-
-            docs = details.get("MichrazDocList", [])
-            if docs:
-                st.markdown(f"#### 📁 מסמכים נוספים ({len(docs)})")
-                for doc in docs[:15]:
-                    d_name = doc.get("DocName", doc.get("Teur", "Unknown"))
-                    d_desc = doc.get("Teur", "")
-                    d_date = doc.get("UpdateDate", "")
-                    if d_date:
-                        dt = pd.to_datetime(d_date, errors="coerce")
-                        if pd.notna(dt):
-                            d_date = dt.strftime("%Y-%m-%d")
-                    d_url = build_document_url(doc)
-                    st.markdown(f"- [{d_name}]({d_url}) — {d_desc} ({d_date})")
-                if len(docs) > 15:
-                    st.caption(f"... ועוד {len(docs) - 15} מסמכים")
-            elif not full_doc:
-                st.info("אין מסמכים זמינים")
-
-            # ── Building Rights ────────────────────────────────────────
-            st.markdown("---")
-            st.markdown("### 🏗️ זכויות בנייה")
-
-            br_data = load_building_rights_data(selected_tender_id)
-            br_status = br_data["extraction_status"]
-
-            if br_status == "none":
-                # No extraction started yet — show trigger button
-                if st.button("📋 נתח זכויות בנייה", key=f"br_btn_{selected_tender_id}"):
-                    with st.spinner("מוריד ומנתח חוברת מכרז..."):
-                        from brochure_analyzer import (
-                            download_and_analyze_brochure,
-                            trigger_extraction_workflow,
-                        )
-                        from db import TenderDB
+                        st.metric("מועד סגירה", "N/A")
+
+                st.markdown("---")
+                st.markdown("### פרטי מכרז")
+                info_left, info_right = st.columns(2)
+
+                with info_left:
+                    tender_name = details.get("MichrazName", "N/A")
+                    city_val = list_data.get("city", "N/A") if list_data else "N/A"
+                    location = details.get("Shchuna", list_data.get("location", "") if list_data else "")
+                    tender_type_val = list_data.get("tender_type", "N/A") if list_data else "N/A"
+                    purpose_val = list_data.get("purpose", "N/A") if list_data else "N/A"
+                    st.markdown(
+                        f'<div class="detail-field">'
+                        f"<strong>שם מכרז:</strong> {tender_name}<br>"
+                        f"<strong>עיר:</strong> {city_val}<br>"
+                        + (f"<strong>מיקום:</strong> {location}<br>" if location else "")
+                        + f"<strong>סוג:</strong> {tender_type_val}<br>"
+                        f"<strong>ייעוד:</strong> {purpose_val}"
+                        f"</div>",
+                        unsafe_allow_html=True,
+                    )
+
+                with info_right:
+                    publish = pd.to_datetime(details.get("PtichaDate"), errors="coerce")
+                    publish_str = publish.strftime("%Y-%m-%d") if pd.notna(publish) else "N/A"
+                    deadline_dt2 = pd.to_datetime(details.get("SgiraDate"), errors="coerce")
+                    deadline_str = deadline_dt2.strftime("%Y-%m-%d %H:%M") if pd.notna(deadline_dt2) else "N/A"
+                    committee = pd.to_datetime(details.get("VaadaDate"), errors="coerce")
+                    committee_str = committee.strftime("%Y-%m-%d") if pd.notna(committee) else "N/A"
+                    st.markdown(
+                        f'<div class="detail-field">'
+                        f"<strong>תאריך פרסום:</strong> {publish_str}<br>"
+                        f"<strong>מועד סגירה:</strong> {deadline_str}<br>"
+                        f"<strong>תאריך ועדה:</strong> {committee_str}"
+                        f"</div>",
+                        unsafe_allow_html=True,
+                    )
+
+                # ── Bids ─────────────────────────────────────────────────────
+                st.markdown("---")
+                st.markdown("### 💰 הצעות ומציעים")
+                plots = details.get("Tik", [])
+                if plots:
+                    for plot_idx, plot in enumerate(plots, 1):
+                        st.markdown(f"#### מגרש {plot_idx}: {plot.get('TikID', 'N/A')}")
+                        winner_name = (plot.get("ShemZoche") or "").strip()
+                        winner_amount = plot.get("SchumZchiya", 0)
+                        if winner_name:
+                            st.success(f"🏆 **זוכה:** {winner_name}")
+                            st.markdown(
+                                f'<div class="detail-field">'
+                                f"<strong>סכום זכייה:</strong> ₪{winner_amount:,.2f} | "
+                                f"<strong>שטח:</strong> {plot.get('Shetach', 0):,} מ\"ר | "
+                                f"<strong>מחיר סף:</strong> ₪{plot.get('MechirSaf', 0):,.2f}"
+                                f"</div>",
+                                unsafe_allow_html=True,
+                            )
+                        bidders = plot.get("mpHatzaaotMitcham", [])
+                        if bidders:
+                            st.info(f"📊 **סה\"כ הצעות:** {len(bidders)}")
+                            bidder_df = pd.DataFrame(bidders).sort_values("HatzaaSum", ascending=False)
+                            disp_bid = bidder_df.copy()
+                            disp_bid["HatzaaSum"] = disp_bid["HatzaaSum"].apply(
+                                lambda x: f"₪{x:,.2f}" if pd.notna(x) else "N/A"
+                            )
+                            disp_bid = disp_bid.rename(columns={
+                                "HatzaaID": "מס' הצעה", "HatzaaSum": "סכום", "HatzaaDescription": "תיאור"
+                            })
+                            st.dataframe(disp_bid, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("אין הצעות למגרש זה")
+                        if plot_idx < len(plots):
+                            st.markdown("---")
+                else:
+                    st.info("אין מידע על הצעות למכרז זה")
+
+                # ── Documents ────────────────────────────────────────────────
+                st.markdown("---")
+                st.markdown("### 📄 מסמכים")
+                full_doc = details.get("MichrazFullDocument")
+                if full_doc and full_doc.get("RowID") is not None:
+                    doc_name = full_doc.get("DocName", "מסמך פרסום מלא.pdf")
+                    doc_url = build_document_url(full_doc)
+                    st.markdown(f"📕 [**הורד: {doc_name}**]({doc_url})")
+
+                docs = details.get("MichrazDocList", [])
+                if docs:
+                    st.markdown(f"#### 📁 מסמכים נוספים ({len(docs)})")
+                    for doc in docs[:15]:
+                        d_name = doc.get("DocName", doc.get("Teur", "Unknown"))
+                        d_desc = doc.get("Teur", "")
+                        d_date = doc.get("UpdateDate", "")
+                        if d_date:
+                            dt = pd.to_datetime(d_date, errors="coerce")
+                            if pd.notna(dt):
+                                d_date = dt.strftime("%Y-%m-%d")
+                        d_url = build_document_url(doc)
+                        st.markdown(f"- [{d_name}]({d_url}) — {d_desc} ({d_date})")
+                    if len(docs) > 15:
+                        st.caption(f"... ועוד {len(docs) - 15} מסמכים")
+                elif not full_doc:
+                    st.info("אין מסמכים זמינים")
+
+                # ── Building Rights ────────────────────────────────────────
+                st.markdown("---")
+                st.markdown("### 🏗️ זכויות בנייה")
+
+                br_data = load_building_rights_data(selected_tender_id)
+                br_status = br_data["extraction_status"]
+
+                if br_status == "none":
+                    # No extraction started yet — show trigger button
+                    if st.button("📋 נתח זכויות בנייה", key=f"br_btn_{selected_tender_id}"):
+                        with st.spinner("מוריד ומנתח חוברת מכרז..."):
+                            from brochure_analyzer import (
+                                download_and_analyze_brochure,
+                                trigger_extraction_workflow,
+                            )
+                            from db import TenderDB
 
-                        br_client = LandTendersClient(data_dir=str(DATA_DIR))
-                        br_result = download_and_analyze_brochure(
-                            selected_tender_id, br_client, details,
-                        )
-
-                        if br_result["success"]:
-                            db = TenderDB()
-                            lots_data = {
-                                "plots": br_result["lots"],
-                                "purpose": br_result["purpose"],
-                            }
-
-                            # Check if building rights already exist
-                            new_status = "queued"
-                            if br_result["plan_number"]:
-                                existing = db.load_building_rights(br_result["plan_number"])
-                                if existing:
-                                    new_status = "complete"
-
-                            db.update_brochure_data(
-                                selected_tender_id,
-                                br_result["plan_number"],
-                                lots_data,
-                                br_result["summary"],
-                                extraction_status=new_status,
+                            br_client = get_client(str(DATA_DIR))
+                            br_result = download_and_analyze_brochure(
+                                selected_tender_id, br_client, details,
                             )
 
-                            # Trigger GitHub Actions if we need Mavat extraction
-                            if new_status == "queued" and br_result["plan_number"]:
-                                triggered = trigger_extraction_workflow(selected_tender_id)
-                                if triggered:
-                                    st.success("✅ ניתוח חוברת הושלם. זכויות בנייה יעובדו תוך 5-10 דקות.")
+                            if br_result["success"]:
+                                db = TenderDB()
+                                lots_data = {
+                                    "plots": br_result["lots"],
+                                    "purpose": br_result["purpose"],
+                                }
+
+                                # Check if building rights already exist
+                                new_status = "queued"
+                                if br_result["plan_number"]:
+                                    existing = db.load_building_rights(br_result["plan_number"])
+                                    if existing:
+                                        new_status = "complete"
+
+                                db.update_brochure_data(
+                                    selected_tender_id,
+                                    br_result["plan_number"],
+                                    lots_data,
+                                    br_result["summary"],
+                                    extraction_status=new_status,
+                                )
+
+                                # Trigger GitHub Actions if we need Mavat extraction
+                                if new_status == "queued" and br_result["plan_number"]:
+                                    triggered = trigger_extraction_workflow(selected_tender_id)
+                                    if triggered:
+                                        st.success("✅ ניתוח חוברת הושלם. זכויות בנייה יעובדו תוך 5-10 דקות.")
+                                    else:
+                                        st.warning("⚠️ ניתוח חוברת הושלם, אך לא הצלחנו להפעיל את עיבוד זכויות הבנייה.")
+                                elif new_status == "complete":
+                                    st.success("✅ ניתוח הושלם — זכויות בנייה כבר קיימות!")
                                 else:
-                                    st.warning("⚠️ ניתוח חוברת הושלם, אך לא הצלחנו להפעיל את עיבוד זכויות הבנייה.")
-                            elif new_status == "complete":
-                                st.success("✅ ניתוח הושלם — זכויות בנייה כבר קיימות!")
-                            else:
-                                st.info("📋 ניתוח חוברת הושלם.")
+                                    st.info("📋 ניתוח חוברת הושלם.")
 
-                            load_building_rights_data.clear()
-                            st.rerun()
-                        else:
-                            st.error(f"❌ ניתוח נכשל: {'; '.join(br_result['errors'])}")
-                else:
-                    st.caption("לחץ לניתוח חוברת המכרז וחילוץ זכויות בנייה")
-
-            elif br_status in ("brochure_extracted", "queued"):
-                # Brochure analyzed, waiting for building rights extraction
-                st.info("⏳ ממתין לעיבוד זכויות בנייה (יושלם תוך דקות)")
-
-                # Show brochure data we already have
-                if br_data["plan_number"]:
-                    st.markdown(f"**תב\"ע:** {br_data['plan_number']}")
-
-                if br_data["lots_data"] and isinstance(br_data["lots_data"], dict):
-                    plots = br_data["lots_data"].get("plots", [])
-                    if plots:
-                        st.markdown("**מגרשים:**")
-                        lots_rows = []
-                        for p in plots:
-                            lots_rows.append({
-                                "גוש": p.get("gush", "-"),
-                                "חלקה": p.get("helka", "-"),
-                                "מגרש": p.get("migrash", "-"),
-                                "שטח": p.get("area", "-"),
-                            })
-                        st.dataframe(pd.DataFrame(lots_rows), use_container_width=True, hide_index=True)
-
-                if br_data["brochure_summary"]:
-                    with st.expander("📋 סיכום חוברת מכרז", expanded=False):
-                        st.text(br_data["brochure_summary"])
+                                load_building_rights_data.clear()
+                                st.rerun()
+                            else:
+                                st.error(f"❌ ניתוח נכשל: {'; '.join(br_result['errors'])}")
+                    else:
+                        st.caption("לחץ לניתוח חוברת המכרז וחילוץ זכויות בנייה")
 
-                # Retry button
-                if st.button("🔄 בדוק שוב", key=f"br_check_{selected_tender_id}"):
-                    load_building_rights_data.clear()
-                    st.rerun()
+                elif br_status in ("brochure_extracted", "queued"):
+                    # Brochure analyzed, waiting for building rights extraction
+                    st.info("⏳ ממתין לעיבוד זכויות בנייה (יושלם תוך דקות)")
 
-            elif br_status == "complete":
-                # Full data available — show everything
-                if br_data["plan_number"]:
-                    st.markdown(f"**תב\"ע:** {br_data['plan_number']}")
-
-                # Building rights table
-                rights = br_data["building_rights"]
-                if rights:
-                    # Build display DataFrame with Hebrew columns
-                    display_rows = []
-                    for row in rights:
-                        display_rows.append({
-                            "יעוד": row.get("designation", "-"),
-                            "שימוש": row.get("use_type", "-"),
-                            "תאי שטח": row.get("area_condition", "-"),
-                            'שטח מגרש (מ"ר)': row.get("plot_size_absolute", "-"),
-                            "שטח בנייה עיקרי": row.get("building_area_above", "-"),
-                            "שטח בנייה סה\"כ": row.get("building_area_total", "-"),
-                            "תכסית %": row.get("coverage_pct", "-"),
-                            'יח"ד': row.get("housing_units", "-"),
-                            "קומות": row.get("floors_above", "-"),
-                            'גובה (מ\')': row.get("building_height", "-"),
-                            "קו בניין קדמי": row.get("setback_front", "-"),
-                            "קו בניין אחורי": row.get("setback_rear", "-"),
-                            "קו בניין צידי": row.get("setback_side", "-"),
-                        })
-
-                    rights_df = pd.DataFrame(display_rows)
-                    st.dataframe(rights_df, use_container_width=True, hide_index=True)
-                    st.caption(f"סה\"כ {len(rights)} שורות מתוך טבלת זכויות בנייה")
-                else:
-                    st.info("לא נמצאו זכויות בנייה עבור התב\"ע")
+                    # Show brochure data we already have
+                    if br_data["plan_number"]:
+                        st.markdown(f"**תב\"ע:** {br_data['plan_number']}")
 
-                # Lots from brochure
-                if br_data["lots_data"] and isinstance(br_data["lots_data"], dict):
-                    plots = br_data["lots_data"].get("plots", [])
-                    if plots:
-                        with st.expander("🏘️ מגרשים מחוברת המכרז", expanded=False):
+                    if br_data["lots_data"] and isinstance(br_data["lots_data"], dict):
+                        plots = br_data["lots_data"].get("plots", [])
+                        if plots:
+                            st.markdown("**מגרשים:**")
                             lots_rows = []
                             for p in plots:
                                 lots_rows.append({
@@ -716,31 +677,91 @@ with st.expander("🔍 צפייה בפרטי מכרז", expanded=False):
                                 })
                             st.dataframe(pd.DataFrame(lots_rows), use_container_width=True, hide_index=True)
 
-                # Brochure summary
-                if br_data["brochure_summary"]:
-                    with st.expander("📋 סיכום חוברת מכרז", expanded=False):
-                        st.text(br_data["brochure_summary"])
-
-            elif br_status == "failed":
-                # Extraction failed — show error and retry
-                error_msg = br_data.get("extraction_error") or "שגיאה לא ידועה"
-                st.error(f"❌ חילוץ זכויות בנייה נכשל: {error_msg}")
-
-                # Still show brochure data if we have it
-                if br_data["brochure_summary"]:
-                    with st.expander("📋 סיכום חוברת מכרז", expanded=False):
-                        st.text(br_data["brochure_summary"])
-
-                if st.button("🔄 נסה שוב", key=f"br_retry_{selected_tender_id}"):
-                    from db import TenderDB
-                    TenderDB().set_extraction_status(selected_tender_id, "none")
-                    load_building_rights_data.clear()
-                    st.rerun()
+                    if br_data["brochure_summary"]:
+                        with st.expander("📋 סיכום חוברת מכרז", expanded=False):
+                            st.text(br_data["brochure_summary"])
+
+                    # Retry button
+                    if st.button("🔄 בדוק שוב", key=f"br_check_{selected_tender_id}"):
+                        load_building_rights_data.clear()
+                        st.rerun()
+
+                elif br_status == "complete":
+                    # Full data available — show everything
+                    if br_data["plan_number"]:
+                        st.markdown(f"**תב\"ע:** {br_data['plan_number']}")
+
+                    # Building rights table
+                    rights = br_data["building_rights"]
+                    if rights:
+                        # Build display DataFrame with Hebrew columns
+                        display_rows = []
+                        for row in rights:
+                            display_rows.append({
+                                "יעוד": row.get("designation", "-"),
+                                "שימוש": row.get("use_type", "-"),
+                                "תאי שטח": row.get("area_condition", "-"),
+                                'שטח מגרש (מ"ר)': row.get("plot_size_absolute", "-"),
+                                "שטח בנייה עיקרי": row.get("building_area_above", "-"),
+                                "שטח בנייה סה\"כ": row.get("building_area_total", "-"),
+                                "תכסית %": row.get("coverage_pct", "-"),
+                                'יח"ד': row.get("housing_units", "-"),
+                                "קומות": row.get("floors_above", "-"),
+                                'גובה (מ\')': row.get("building_height", "-"),
+                                "קו בניין קדמי": row.get("setback_front", "-"),
+                                "קו בניין אחורי": row.get("setback_rear", "-"),
+                                "קו בניין צידי": row.get("setback_side", "-"),
+                            })
+
+                        rights_df = pd.DataFrame(display_rows)
+                        st.dataframe(rights_df, use_container_width=True, hide_index=True)
+                        st.caption(f"סה\"כ {len(rights)} שורות מתוך טבלת זכויות בנייה")
+                    else:
+                        st.info("לא נמצאו זכויות בנייה עבור התב\"ע")
+
+                    # Lots from brochure
+                    if br_data["lots_data"] and isinstance(br_data["lots_data"], dict):
+                        plots = br_data["lots_data"].get("plots", [])
+                        if plots:
+                            with st.expander("🏘️ מגרשים מחוברת המכרז", expanded=False):
+                                lots_rows = []
+                                for p in plots:
+                                    lots_rows.append({
+                                        "גוש": p.get("gush", "-"),
+                                        "חלקה": p.get("helka", "-"),
+                                        "מגרש": p.get("migrash", "-"),
+                                        "שטח": p.get("area", "-"),
+                                    })
+                                st.dataframe(pd.DataFrame(lots_rows), use_container_width=True, hide_index=True)
+
+                    # Brochure summary
+                    if br_data["brochure_summary"]:
+                        with st.expander("📋 סיכום חוברת מכרז", expanded=False):
+                            st.text(br_data["brochure_summary"])
+
+                elif br_status == "failed":
+                    # Extraction failed — show error and retry
+                    error_msg = br_data.get("extraction_error") or "שגיאה לא ידועה"
+                    st.error(f"❌ חילוץ זכויות בנייה נכשל: {error_msg}")
+
+                    # Still show brochure data if we have it
+                    if br_data["brochure_summary"]:
+                        with st.expander("📋 סיכום חוברת מכרז", expanded=False):
+                            st.text(br_data["brochure_summary"])
+
+                    if st.button("🔄 נסה שוב", key=f"br_retry_{selected_tender_id}"):
+                        from db import TenderDB
+                        TenderDB().set_extraction_status(selected_tender_id, "none")
+                        load_building_rights_data.clear()
+                        st.rerun()
+
+                st.markdown("---")
+                st.markdown(f"🔗 [צפה באתר רמ\"י]({RMI_SITE_URL}/{selected_tender_id})")
+            else:
+                st.error(f"לא ניתן לטעון פרטים למכרז {selected_tender_id}")
 
-            st.markdown("---")
-            st.markdown(f"🔗 [צפה באתר רמ\"י]({RMI_SITE_URL}/{selected_tender_id})")
-        else:
-            st.error(f"לא ניתן לטעון פרטים למכרז {selected_tender_id}")
+
+_render_tender_detail_viewer()
 
 
 # ============================================================================
@@ -829,7 +850,7 @@ with st.expander("📋 מכרזים נבחרים — סטטוס סקירה", exp
     _review_db = UserDB()
 
     _team_ids = _review_db.get_watchlist_ids(TEAM_EMAIL)
-    _team_df = df[df["tender_id"].astype(int).isin(_team_ids)].copy() if _team_ids else pd.DataFrame()
+    _team_df = df[df["tender_id"].astype(int).isin(_team_ids)] if _team_ids else pd.DataFrame()
 
     _REVIEW_EMOJI: dict[str, str] = {
         "לא נסקר": "⬜",
@@ -840,18 +861,18 @@ with st.expander("📋 מכרזים נבחרים — סטטוס סקירה", exp
     }
 
     if len(_team_df) > 0:
-        _rev_tbl = _team_df[["tender_name", "city", "tender_type", "units"]].copy()
         _rev_ids = _team_df["tender_id"].astype(int).tolist()
         _rev_map = _review_db.get_review_statuses_for_tenders(_rev_ids)
 
-        _rev_tbl["review"] = [
+        # Project the four display columns first; assign copies only those
+        _rev_tbl = _team_df[["tender_name", "city", "tender_type", "units"]].assign(review=[
             _REVIEW_EMOJI.get(
                 _rev_map.get(int(tid), {}).get("status", "לא נסקר"), "⬜"
             )
             + " "
             + _rev_map.get(int(tid), {}).get("status", "לא נסקר")
             for tid in _team_df["tender_id"]
-        ]
+        ])
 
         st.dataframe(
             _rev_tbl,
@@ -913,16 +934,20 @@ with st.expander("📋 מכרזים נבחרים — סטטוס סקירה", exp
 # ============================================================================
 
 with st.expander("📊 ניתוח מפורט", expanded=False):
+    # Tender count and units per type in one grouped pass (type pie + units bar)
+    type_stats = active_df.groupby("tender_type", observed=True)["units"].agg(["size", "sum"])
+
     chart_col1, chart_col2 = st.columns(2)
 
     with chart_col1:
         st.markdown("**📍 מכרזים לפי עיר**")
-        city_counts = active_df["city"].value_counts().head(10)
+        city_counts = active_df["city"].value_counts()
+        city_counts = city_counts[city_counts > 0].head(10)
         if len(city_counts) > 0:
             fig_city = px.bar(
                 x=city_counts.values, y=city_counts.index, orientation="h",
                 labels={"x": "מספר מכרזים", "y": "עיר"},
-                color=city_counts.values, color_continuous_scale=MEGIDO_GOLD_SCALE,
+                color_discrete_sequence=["#D4A017"],
             )
             fig_city.update_layout(
                 showlegend=False, height=260,
@@ -935,7 +960,7 @@ with st.expander("📊 ניתוח מפורט", expanded=False):
 
     with chart_col2:
         st.markdown("**🏷️ מכרזים לפי סוג**")
-        type_counts = active_df["tender_type"].value_counts()
+        type_counts = type_stats["size"].sort_values(ascending=False)
         if len(type_counts) > 0:
             fig_type = px.pie(
                 values=type_counts.values, names=type_counts.index,
@@ -953,10 +978,12 @@ with st.expander("📊 ניתוח מפורט", expanded=False):
 
     with chart_col3:
         st.markdown("**📈 מכרזים לאורך זמן**")
-        timeline_df = active_df.copy()
-        if len(timeline_df) > 0 and timeline_df["publish_date"].notna().any():
-            timeline_df["month"] = timeline_df["publish_date"].dt.to_period("M").astype(str)
-            monthly = timeline_df.groupby("month").size().reset_index(name="count")
+        if len(active_df) > 0 and active_df["publish_date"].notna().any():
+            # One point per calendar month (empty months plot as 0), however many rows
+            monthly = (
+                active_df.resample("MS", on="publish_date").size()
+                .rename_axis("month").reset_index(name="count")
+            )
             fig_tl = px.line(
                 monthly, x="month", y="count", markers=True,
                 labels={"month": "חודש", "count": "מספר"},
@@ -972,7 +999,7 @@ with st.expander("📊 ניתוח מפורט", expanded=False):
 
     with chart_col4:
         st.markdown('**🏠 יח"ד לפי סוג**')
-        units_by_type = active_df.groupby("tender_type")["units"].sum().reset_index()
+        units_by_type = type_stats["sum"].rename("units").reset_index()
         units_by_type = units_by_type[units_by_type["units"] > 0]
         if not units_by_type.empty:
             fig_u = px.bar(
@@ -8,8 +8,9 @@ Branded for MEGIDO BY AURA (מגידו י.ק.).
 
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Union
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -59,15 +60,15 @@ if 'deadline' in active_df.columns:
 # HELPERS
 # ============================================================================
 
-def _urgency(days: Optional[int]) -> str:
-    """Return urgency emoji based on days remaining."""
-    if days is None or pd.isna(days):
-        return "⚪"
-    if days <= 7:
-        return "🔴"
-    if days <= 14:
-        return "🟡"
-    return "🟢"
+# Inclusive days-left bin edges (≤7 red, ≤14 yellow, else green); ⚪ = unknown
+_URGENCY_EDGES = np.array([7, 14])
+_URGENCY_EMOJI = np.array(["🔴", "🟡", "🟢", "⚪"])
+
+
+def _urgency(days: Union[pd.Series, int]) -> np.ndarray:
+    """Return urgency emoji(s) based on days remaining, by bin index."""
+    d = np.asarray(days, dtype=float)
+    return _URGENCY_EMOJI[np.where(np.isnan(d), 3, np.searchsorted(_URGENCY_EDGES, d))]
 
 
 _REVIEW_EMOJI: dict[str, str] = {
@@ -99,23 +100,15 @@ def _build_compact_table(
     ]].copy()
 
     tbl['deadline'] = pd.to_datetime(tbl['deadline'], errors='coerce')
-    tbl['days_left'] = tbl['deadline'].apply(
-        lambda d: (d - today).days if pd.notna(d) else None
-    )
-    tbl['urgency'] = tbl['days_left'].apply(_urgency)
+    tbl['days_left'] = (tbl['deadline'] - today).dt.days
+    tbl['urgency'] = _urgency(tbl['days_left'])
 
+    # Build the label column-wise; rows without a deadline fall back to "—"
+    deadline_fmt = tbl['urgency'] + " " + tbl['deadline'].dt.strftime('%d/%m')
     if show_days_count:
-        tbl['deadline_fmt'] = tbl.apply(
-            lambda r: f"{r['urgency']} {r['deadline'].strftime('%d/%m')} ({int(r['days_left'])}ד׳)"
-            if pd.notna(r['deadline']) and pd.notna(r['days_left']) else "—",
-            axis=1,
-        )
-    else:
-        tbl['deadline_fmt'] = tbl.apply(
-            lambda r: f"{r['urgency']} {r['deadline'].strftime('%d/%m')}"
-            if pd.notna(r['deadline']) else "—",
-            axis=1,
-        )
+        days = tbl['days_left'].astype('Int64').astype(str)
+        deadline_fmt = deadline_fmt + " (" + days + "ד׳)"
+    tbl['deadline_fmt'] = deadline_fmt.where(tbl['deadline'].notna(), "—")
 
     tbl['booklet'] = tbl['published_booklet'].apply(
         lambda x: "✅" if x else "❌"
@@ -189,11 +182,10 @@ st.markdown("---")
 
 st.markdown("#### ⏰ נסגרים בקרוב")
 
+# One datetime64 range compare; NaT deadlines compare False and drop out
 closing_soon = active_df[
-    (active_df['deadline'].notna()) &
-    (active_df['deadline'] >= today) &
-    (active_df['deadline'] <= today + timedelta(days=CLOSING_SOON_DAYS))
-].sort_values('deadline').copy()
+    active_df['deadline'].between(today, today + timedelta(days=CLOSING_SOON_DAYS))
+].sort_values('deadline')
 
 
 @st.dialog("📋 פרטי מכרז", width="large")
@@ -35,7 +35,7 @@ import logging
 import sys
 import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -45,6 +45,10 @@ from data_client import LandTendersClient
 from db import TenderDB
 from tender_pdf_extractor import TenderPDFExtractor
 
+if TYPE_CHECKING:
+    # Imported lazily at runtime: it pulls in Playwright
+    from mavat_client import MavatClient
+
 logging.basicConfig(
     level=logging.INFO,
     format="[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
@@ -61,6 +65,26 @@ MAVAT_DELAY = 5
 # Maximum tenders to process per run (to avoid CI timeout)
 MAX_PER_RUN = 10
 
+# One MavatClient (and Chromium process) shared by every plan in the run
+_mavat_client: Optional["MavatClient"] = None
+
+
+def _get_mavat_client() -> "MavatClient":
+    """Return the run-wide MavatClient, creating it on first use."""
+    global _mavat_client
+    if _mavat_client is None:
+        from mavat_client import MavatClient
+        _mavat_client = MavatClient(output_dir=MAVAT_DIR)
+    return _mavat_client
+
+
+def _close_mavat_client() -> None:
+    """Shut down the shared MavatClient's browser, if one was started."""
+    global _mavat_client
+    if _mavat_client is not None:
+        _mavat_client.close()
+        _mavat_client = None
+
 
 def _download_brochure(
     client: LandTendersClient,
@@ -142,9 +166,7 @@ def _download_mavat_plan(plan_number: str) -> Optional[Path]:
         return cached
 
     try:
-        from mavat_client import MavatClient
-        client = MavatClient(output_dir=MAVAT_DIR)
-        result = client.download_horaot(plan_number)
+        result = _get_mavat_client().download_horaot(plan_number)
 
         if result["status"] == "success":
             return Path(result["file_path"])
@@ -381,45 +403,48 @@ def main() -> None:
     db = TenderDB()
     results = []
 
-    if args.plan_numbers:
-        # Direct plan number processing (no brochure, no tender lookup)
-        logger.info("Processing %d plan numbers directly...", len(args.plan_numbers))
-        for plan_num in args.plan_numbers:
-            res = process_plan_directly(plan_num, db, dry_run=args.dry_run)
-            results.append(res)
-            logger.info("Plan %s: %s", plan_num, res["status"])
-            if res["status"] not in ("already_extracted", "success"):
-                time.sleep(MAVAT_DELAY)
-
-    else:
-        # Tender-based processing
-        if args.tender_ids:
-            tender_ids = args.tender_ids
+    try:
+        if args.plan_numbers:
+            # Direct plan number processing (no brochure, no tender lookup)
+            logger.info("Processing %d plan numbers directly...", len(args.plan_numbers))
+            for plan_num in args.plan_numbers:
+                res = process_plan_directly(plan_num, db, dry_run=args.dry_run)
+                results.append(res)
+                logger.info("Plan %s: %s", plan_num, res["status"])
+                if res["status"] not in ("already_extracted", "success"):
+                    time.sleep(MAVAT_DELAY)
+
         else:
-            tender_ids = get_watchlist_tender_ids(db)
-
-        if not tender_ids:
-            logger.info("No tenders to process")
-            return
-
-        # Limit to max_per_run
-        if len(tender_ids) > args.max_per_run:
-            logger.info(
-                "Processing %d/%d tenders (limited by --max-per-run)",
-                args.max_per_run, len(tender_ids),
-            )
-            tender_ids = tender_ids[:args.max_per_run]
-
-        client = LandTendersClient()
-
-        for tender_id in tender_ids:
-            res = process_tender(tender_id, db, client, dry_run=args.dry_run)
-            results.append(res)
-            logger.info("Tender %d: %s", tender_id, res["status"])
-
-            # Rate limit between Mavat requests
-            if res["status"] not in ("already_extracted", "tender_not_found", "no_brochure"):
-                time.sleep(MAVAT_DELAY)
+            # Tender-based processing
+            if args.tender_ids:
+                tender_ids = args.tender_ids
+            else:
+                tender_ids = get_watchlist_tender_ids(db)
+
+            if not tender_ids:
+                logger.info("No tenders to process")
+                return
+
+            # Limit to max_per_run
+            if len(tender_ids) > args.max_per_run:
+                logger.info(
+                    "Processing %d/%d tenders (limited by --max-per-run)",
+                    args.max_per_run, len(tender_ids),
+                )
+                tender_ids = tender_ids[:args.max_per_run]
+
+            client = LandTendersClient()
+
+            for tender_id in tender_ids:
+                res = process_tender(tender_id, db, client, dry_run=args.dry_run)
+                results.append(res)
+                logger.info("Tender %d: %s", tender_id, res["status"])
+
+                # Rate limit between Mavat requests
+                if res["status"] not in ("already_extracted", "tender_not_found", "no_brochure"):
+                    time.sleep(MAVAT_DELAY)
+    finally:
+        _close_mavat_client()
 
     # Summary
     statuses = {}
@@ -112,7 +112,7 @@ def migrate_documents(db: TenderDB) -> int:
 
     logger.info("Found %d cached detail files to migrate", len(detail_files))
 
-    total_docs = 0
+    docs_by_tender: dict[int, list[dict]] = {}
 
     for i, filepath in enumerate(detail_files, 1):
         try:
@@ -128,8 +128,7 @@ def migrate_documents(db: TenderDB) -> int:
                 doc_list.append(full_doc)
 
             if doc_list:
-                new_docs = db.upsert_documents(tender_id, doc_list)
-                total_docs += len(new_docs)
+                docs_by_tender[tender_id] = doc_list
 
         except Exception as exc:
             logger.error("Failed to process %s: %s", filepath.name, exc)
@@ -138,7 +137,8 @@ def migrate_documents(db: TenderDB) -> int:
         if i % 50 == 0:
             logger.info("Progress: %d/%d detail files processed", i, len(detail_files))
 
-    return total_docs
+    new_docs = db.upsert_documents_bulk(docs_by_tender)
+    return sum(len(docs) for docs in new_docs.values())
 
 
 def main() -> None:
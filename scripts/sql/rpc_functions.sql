@@ -0,0 +1,74 @@
+-- ==========================================================================
+-- Server-side helper functions and views (PostgREST) used by db.py
+-- Run this in Supabase SQL Editor. Safe to re-run (CREATE OR REPLACE).
+-- db.py falls back to client-side queries if a function or view is missing.
+-- ==========================================================================
+
+-- 1. Distinct snapshot dates (used by TenderDB.get_snapshot_dates)
+--    Returns one row per date instead of one row per history snapshot.
+CREATE OR REPLACE FUNCTION distinct_snapshot_dates()
+RETURNS TABLE (snapshot_date DATE)
+LANGUAGE sql STABLE
+AS $$
+    SELECT DISTINCT h.snapshot_date
+    FROM tender_history h
+    WHERE h.snapshot_date IS NOT NULL
+    ORDER BY 1;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_tender_history_snapshot_date
+    ON tender_history(snapshot_date);
+
+GRANT EXECUTE ON FUNCTION distinct_snapshot_dates() TO anon;
+GRANT EXECUTE ON FUNCTION distinct_snapshot_dates() TO service_role;
+
+-- 2. Documents joined with their tender (used by TenderDB.get_new_documents)
+--    One paginated read instead of documents + IN(tender_ids) + client merge.
+CREATE OR REPLACE VIEW v_new_documents AS
+SELECT
+    d.*,
+    t.tender_name,
+    t.city,
+    t.region
+FROM tender_documents d
+LEFT JOIN tenders t ON t.tender_id = d.tender_id;
+
+CREATE INDEX IF NOT EXISTS idx_tender_documents_first_seen
+    ON tender_documents(first_seen);
+
+GRANT SELECT ON v_new_documents TO anon;
+GRANT SELECT ON v_new_documents TO service_role;
+
+-- 3. Extraction queue (used by TenderDB.get_pending_extractions)
+--    Partial index holds only queued rows, so polling the queue costs
+--    O(queue depth) instead of walking every 'queued'/'none'/... entry.
+CREATE INDEX IF NOT EXISTS idx_tenders_extraction_queued
+    ON tenders(tender_id)
+    WHERE extraction_status = 'queued' AND plan_number IS NOT NULL;
+
+-- 4. Set-based history snapshot insert (used by TenderDB.upsert_tenders)
+--    One request and one INSERT ... SELECT for the whole snapshot instead of
+--    one PostgREST upsert per 500 rows. Rows are decoded with the table's own
+--    row type, so column types stay defined in one place.
+CREATE OR REPLACE FUNCTION bulk_insert_history(rows JSONB)
+RETURNS INTEGER
+LANGUAGE sql VOLATILE
+AS $$
+    WITH ins AS (
+        INSERT INTO tender_history
+            (tender_id, snapshot_date, status_code, status, units, deadline)
+        SELECT r.tender_id, r.snapshot_date, r.status_code, r.status, r.units, r.deadline
+        FROM jsonb_populate_recordset(NULL::tender_history, rows) r
+        ON CONFLICT (tender_id, snapshot_date) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM ins;
+$$;
+
+GRANT EXECUTE ON FUNCTION bulk_insert_history(JSONB) TO anon;
+GRANT EXECUTE ON FUNCTION bulk_insert_history(JSONB) TO service_role;
+
+-- 5. Row fingerprint (used by TenderDB.upsert_tenders)
+--    Hash of the tender's API fields; rows whose hash is unchanged are not
+--    re-sent on the next ingest. NULL until a row is next written.
+ALTER TABLE tenders ADD COLUMN IF NOT EXISTS content_hash TEXT;
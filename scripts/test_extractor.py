@@ -5,7 +5,7 @@ import json
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mavat_plan_extractor import extractor
+from mavat_plan_extractor import get_extractor
 
 def test_extractor():
     plan_number = "102-0909267"
@@ -13,7 +13,7 @@ def test_extractor():
     print("-" * 50)
     
     try:
-        result = extractor.process_plan(plan_number)
+        result = get_extractor().process_plan(plan_number)
         
         print("\n--- RESULT ---")
         print(f"Status: {result.get('status')}")
@@ -32,6 +32,8 @@ def test_extractor():
         print(f"CRITICAL ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        get_extractor().close()
 
 if __name__ == "__main__":
     test_extractor()
@@ -5,7 +5,7 @@ import logging
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mavat_plan_extractor import extractor
+from mavat_plan_extractor import get_extractor
 
 # Configure logging to see what's happening
 logging.basicConfig(level=logging.INFO)
@@ -16,7 +16,7 @@ def test_url_extraction():
     print("-" * 50)
     
     try:
-        result = extractor.process_plan(url)
+        result = get_extractor().process_plan(url)
         
         print("\n--- RESULT ---")
         print(f"Status: {result.get('status')}")
@@ -37,6 +37,8 @@ def test_url_extraction():
         print(f"CRITICAL ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        get_extractor().close()
 
 if __name__ == "__main__":
     test_url_extraction()
@@ -0,0 +1,353 @@
+"""Tests for the pure helper functions in db.py.
+
+Covers payload cleaning and frame construction — the parts of the Supabase
+layer that transform data without touching the network.
+
+Usage:
+    pytest test_db.py -v
+"""
+
+import math
+from types import SimpleNamespace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import db
+from db import (
+    _clean_frame,
+    _clean_val,
+    _content_hash,
+    _execute,
+    _frame_records,
+    _pages_to_frame,
+    _to_jsonable,
+    _to_naive_datetime,
+)
+
+
+# ---------------------------------------------------------------------------
+# Payload cleaning
+# ---------------------------------------------------------------------------
+
+
+class TestCleanVal:
+    """Tests for _clean_val()."""
+
+    def test_none(self) -> None:
+        assert _clean_val(None) is None
+
+    def test_nan(self) -> None:
+        assert _clean_val(float("nan")) is None
+
+    def test_inf(self) -> None:
+        assert _clean_val(math.inf) is None
+
+    def test_bool_to_int(self) -> None:
+        assert _clean_val(True) == 1
+        assert type(_clean_val(False)) is int
+
+    def test_numpy_bool_to_int(self) -> None:
+        assert _clean_val(np.bool_(True)) == 1
+
+    def test_nat(self) -> None:
+        assert _clean_val(pd.NaT) is None
+
+    def test_numpy_float_nan(self) -> None:
+        assert _clean_val(np.float64("nan")) is None
+
+    def test_timestamp(self) -> None:
+        assert _clean_val(pd.Timestamp("2026-02-17")) == "2026-02-17T00:00:00"
+
+    def test_plain_values_pass_through(self) -> None:
+        assert _clean_val("תל אביב") == "תל אביב"
+        assert _clean_val(42) == 42
+
+
+class TestCleanFrame:
+    """Tests for _clean_frame()."""
+
+    def test_float_nan_and_inf_become_none(self) -> None:
+        df = pd.DataFrame({"units": [3.0, np.nan, np.inf]})
+        assert _clean_frame(df)["units"].tolist() == [3.0, None, None]
+
+    def test_nat_becomes_none(self) -> None:
+        df = pd.DataFrame({"deadline": [pd.Timestamp("2026-01-01"), pd.NaT]})
+        cleaned = _clean_frame(df)["deadline"].tolist()
+        assert cleaned[0] == pd.Timestamp("2026-01-01")
+        assert cleaned[1] is None
+
+    def test_input_not_mutated(self) -> None:
+        df = pd.DataFrame({"units": [np.nan]})
+        _clean_frame(df)
+        assert math.isnan(df["units"].iloc[0])
+
+    def test_other_columns_unchanged(self) -> None:
+        df = pd.DataFrame({"tender_id": [1, 2], "city": ["חיפה", None]})
+        pd.testing.assert_frame_equal(_clean_frame(df), df)
+
+
+class TestFrameRecords:
+    """Tests for _frame_records()."""
+
+    def test_missing_values_become_none(self) -> None:
+        df = pd.DataFrame({
+            "name": ["a", np.nan],
+            "units": [1.0, np.inf],
+            "gush": pd.array([1, None], dtype="Int64"),
+        })
+        assert _frame_records(df)[1] == {"name": None, "units": None, "gush": None}
+
+    def test_bool_to_int(self) -> None:
+        df = pd.DataFrame({"flag": [True, False], "mixed": [True, None]})
+        assert _frame_records(df) == [
+            {"flag": 1, "mixed": 1},
+            {"flag": 0, "mixed": None},
+        ]
+
+    def test_timestamp_to_isoformat(self) -> None:
+        df = pd.DataFrame({"deadline": [pd.Timestamp("2026-02-17"), pd.NaT]})
+        assert [r["deadline"] for r in _frame_records(df)] == [
+            "2026-02-17T00:00:00", None,
+        ]
+
+
+class TestContentHash:
+    """Tests for _content_hash()."""
+
+    def test_int_float_round_trip_hashes_equal(self) -> None:
+        ints = pd.DataFrame({"tender_id": [1, 2], "units": [10, 20], "city": ["a", "b"]})
+        floats = ints.astype({"units": "float64"})
+        objects = ints.astype({"units": object})
+        hashes = [
+            [_content_hash(r) for r in _frame_records(df)]
+            for df in (ints, floats, objects)
+        ]
+        assert hashes[0] == hashes[1] == hashes[2]
+
+    def test_value_change_changes_hash(self) -> None:
+        base = {"tender_id": 1, "units": 10, "city": "a"}
+        assert _content_hash(base) != _content_hash({**base, "units": 11})
+
+    def test_key_order_ignored(self) -> None:
+        assert _content_hash({"a": 1, "b": None}) == _content_hash({"b": None, "a": 1})
+
+
+class TestToJsonable:
+    """Tests for _to_jsonable()."""
+
+    def test_nested_nan_becomes_none(self) -> None:
+        lots = {"lots": [{"area": float("nan"), "units": np.int64(4)}]}
+        assert _to_jsonable(lots) == {"lots": [{"area": None, "units": 4}]}
+
+    def test_bools_and_keys(self) -> None:
+        assert _to_jsonable({1: True, "x": (np.bool_(False),)}) == {"1": True, "x": [False]}
+
+    def test_other_values_stringified(self) -> None:
+        assert _to_jsonable(pd.Timestamp("2026-02-17")) == "2026-02-17 00:00:00"
+        assert _to_jsonable(pd.NaT) is None
+
+
+# ---------------------------------------------------------------------------
+# Frame construction
+# ---------------------------------------------------------------------------
+
+
+class TestPagesToFrame:
+    """Tests for _pages_to_frame()."""
+
+    def test_empty(self) -> None:
+        assert _pages_to_frame([]).empty
+        assert _pages_to_frame([[]]).empty
+
+    def test_matches_list_of_dicts(self) -> None:
+        rows = [{"tender_id": 1, "city": "חיפה"}, {"tender_id": 2, "city": None}]
+        pd.testing.assert_frame_equal(
+            _pages_to_frame([rows]), pd.DataFrame(rows), check_dtype=False,
+        )
+
+    def test_string_columns_are_string_dtype(self) -> None:
+        rows = [{"tender_id": 1, "city": "חיפה"}, {"tender_id": 2, "city": None}]
+        df = _pages_to_frame([rows])
+        assert pd.api.types.is_string_dtype(df["city"])
+        assert pd.api.types.is_integer_dtype(df["tender_id"])
+
+    def test_pages_are_concatenated_in_order(self) -> None:
+        pages = iter([
+            [{"id": 1, "units": None}],
+            [{"id": 2, "units": 3}],
+            [{"id": 3, "units": 2.5}],
+        ])
+        df = _pages_to_frame(pages)
+        assert df["id"].tolist() == [1, 2, 3]
+        assert df["units"].tolist()[1:] == [3.0, 2.5]
+
+    def test_mixed_types_fall_back(self) -> None:
+        pages = [[{"value": 1}], [{"value": "x"}, {"value": 2}], [{"value": 3}]]
+        assert _pages_to_frame(pages)["value"].tolist() == [1, "x", 2, 3]
+
+
+class TestToNaiveDatetime:
+    """Tests for _to_naive_datetime()."""
+
+    def test_utc_offset_is_normalized(self) -> None:
+        s = pd.Series(["2026-01-01T02:00:00+02:00"])
+        assert _to_naive_datetime(s).iloc[0] == pd.Timestamp("2026-01-01 00:00:00")
+
+    def test_result_is_tz_naive(self) -> None:
+        s = pd.Series(["2026-01-01T00:00:00+00:00"])
+        assert _to_naive_datetime(s).dt.tz is None
+
+    def test_invalid_becomes_nat(self) -> None:
+        s = pd.Series(["not a date", None])
+        assert _to_naive_datetime(s).isna().all()
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+
+
+class _APIError(Exception):
+    """Stand-in for postgrest's APIError (carries a ``code``)."""
+
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+class _FlakyQuery:
+    """Request builder whose execute() raises the queued errors first."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def execute(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestExecute:
+    """Tests for _execute()."""
+
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(db.time, "sleep", lambda _: None)
+
+    def test_retries_rate_limit_and_gateway_errors(self) -> None:
+        query = _FlakyQuery(_APIError("429"), _APIError("503"), ConnectionError())
+        assert _execute(query) == "ok"
+        assert query.calls == 4
+
+    def test_permanent_error_not_retried(self) -> None:
+        query = _FlakyQuery(_APIError("23505"))
+        with pytest.raises(_APIError):
+            _execute(query)
+        assert query.calls == 1
+
+    def test_interactive_budget_gives_up_early(self) -> None:
+        query = _FlakyQuery(*[_APIError("503")] * (db._MAX_RETRIES + 1))
+        with pytest.raises(_APIError):
+            _execute(query, max_retries=db._INTERACTIVE_RETRIES)
+        assert query.calls == db._INTERACTIVE_RETRIES + 1
+
+    def test_gives_up_after_max_retries(self) -> None:
+        query = _FlakyQuery(*[_APIError("502")] * (db._MAX_RETRIES + 1))
+        with pytest.raises(_APIError):
+            _execute(query)
+        assert query.calls == db._MAX_RETRIES + 1
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+
+class _FakeTableQuery:
+    """Table request builder serving a slice of ``rows`` per range()."""
+
+    def __init__(self, rows: list[dict], count: Optional[int]) -> None:
+        self.rows = rows
+        self.count = count
+        self.bounds = (0, len(rows) - 1)
+
+    def select(self, *_args: object, **_kwargs: object) -> "_FakeTableQuery":
+        return self
+
+    def order(self, *_args: object, **_kwargs: object) -> "_FakeTableQuery":
+        return self
+
+    @property
+    def not_(self) -> "_FakeTableQuery":
+        return self
+
+    def is_(self, *_args: object) -> "_FakeTableQuery":
+        return self
+
+    def limit(self, size: int) -> "_FakeTableQuery":
+        return self.range(0, size - 1)
+
+    def range(self, start: int, end: int) -> "_FakeTableQuery":
+        query = _FakeTableQuery(self.rows, self.count)
+        query.bounds = (start, end)
+        return query
+
+    def execute(self) -> SimpleNamespace:
+        start, end = self.bounds
+        return SimpleNamespace(data=self.rows[start : end + 1], count=self.count)
+
+
+class TestPaginatedPages:
+    """Tests for TenderDB._paginated_pages()."""
+
+    @staticmethod
+    def _db(rows: list[dict], count: Optional[int]) -> db.TenderDB:
+        tender_db = db.TenderDB.__new__(db.TenderDB)
+        tender_db._client = SimpleNamespace(
+            table=lambda _name: _FakeTableQuery(rows, count),
+        )
+        return tender_db
+
+    @pytest.fixture(autouse=True)
+    def _small_pages(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(db, "_PAGE_SIZE", 3)
+
+    @pytest.mark.parametrize("count", [7, None])
+    def test_all_rows_returned_in_order(self, count: Optional[int]) -> None:
+        rows = [{"tender_id": i} for i in range(7)]
+        pages = list(self._db(rows, count)._paginated_pages("tenders", order_col="tender_id"))
+        assert [r for page in pages for r in page] == rows
+
+    def test_missing_count_stops_on_exact_multiple(self) -> None:
+        rows = [{"tender_id": i} for i in range(6)]
+        pages = list(self._db(rows, None)._paginated_pages("tenders", order_col="tender_id"))
+        assert [len(p) for p in pages] == [3, 3, 0]
+
+
+class TestTendersFreshnessToken:
+    """Tests for TenderDB.get_tenders_freshness_token()."""
+
+    @staticmethod
+    def _db(rows: list[dict], count: Optional[int]) -> db.TenderDB:
+        tender_db = db.TenderDB.__new__(db.TenderDB)
+        tender_db._client = SimpleNamespace(
+            table=lambda _name: _FakeTableQuery(rows, count),
+        )
+        return tender_db
+
+    def test_token_combines_count_and_newest_update(self) -> None:
+        rows = [{"last_updated": "2026-10-16T08:00:00"}, {"last_updated": "2026-10-15T08:00:00"}]
+        assert self._db(rows, 2).get_tenders_freshness_token() == "2:2026-10-16T08:00:00"
+
+    def test_empty_table(self) -> None:
+        assert self._db([], 0).get_tenders_freshness_token() == "0:"
+
+    def test_no_client(self) -> None:
+        tender_db = db.TenderDB.__new__(db.TenderDB)
+        tender_db._client = None
+        assert tender_db.get_tenders_freshness_token() is None
@@ -16,6 +16,7 @@ Usage:
 """
 
 import logging
+import threading
 from datetime import date, datetime
 from typing import Optional
 
@@ -33,8 +34,13 @@ REVIEW_STAGES: list[str] = [
 ]
 
 
-def _get_client():
-    """Return a Supabase client or None if credentials are not configured."""
+# Process-wide Supabase client, created lazily by _get_client().
+_client = None
+_client_lock = threading.Lock()
+
+
+def _create_client():
+    """Create a new Supabase client, or None if credentials are not configured."""
     try:
         from supabase import create_client
 
@@ -49,6 +55,22 @@ def _get_client():
         return None
 
 
+def _get_client():
+    """Return the shared Supabase client or None if credentials are not configured.
+
+    The client is created once per process and reused by every UserDB and
+    TenderDB instance, so its pooled keep-alive HTTP connections are not
+    thrown away (and TLS re-negotiated) each time a page builds a new DB
+    object. A failed attempt is not cached, so it is retried on next use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
 class UserDB:
     """Persistent user data storage backed by Supabase PostgreSQL.
 